@@ -0,0 +1,154 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import SchedulingEngine
+import TraceLoader
+import VectorEngine
+from ResultCache import ResultCache
+from VectorEngine import ProcessTable
+
+# Parameter sweeps over algorithm x quantum x DVFS settings x trace.
+#
+# Each trace is copied once into shared memory; workers map the same pages
+# instead of receiving a pickled copy per task. Runs are grouped by
+# (trace, algorithm, quantum) because the DVFS settings only change the energy
+# total, not the schedule, so every schedule is computed exactly once. With a
+# cache directory, schedules are also kept on disk across sweeps, so re-running
+# a sweep over unchanged traces only computes the new configurations.
+
+FIELDS = ["trace", "algorithm", "quantum", "threshold", "low_factor", "high_factor",
+          "processes", "avg_waiting", "avg_turnaround", "energy", "seconds"]
+
+_traces = {}
+_blocks = []
+_dvfs = []
+_base_energy_unit = 1.5
+_cache = None
+
+
+def sweep(traces, algorithms=SchedulingEngine.ALGORITHMS, quanta=(2,), thresholds=(5,), low_factors=(0.8,),
+          high_factors=(1.2,), base_energy_unit=1.5, workers=None, cache_dir=None):
+    # traces: mapping of name -> ProcessTable; returns one row dict per configuration
+    tasks = []
+    for name in traces:
+        for algorithm in algorithms:
+            for quantum in (quanta if algorithm == "Round Robin" else [None]):
+                tasks.append((name, algorithm, quantum))
+    dvfs = list(itertools.product(thresholds, low_factors, high_factors))
+
+    blocks = []
+    try:
+        layout = {}
+        for name, table in traces.items():
+            layout[name] = {}
+            for column in ("arrival", "burst", "priority"):
+                block, spec = _share(getattr(table, column))
+                blocks.append(block)
+                layout[name][column] = spec
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(layout, dvfs, base_energy_unit, cache_dir)) as pool:
+            for task_rows in pool.map(_run_task, tasks):
+                rows.extend(task_rows)
+        return rows
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _share(column):
+    column = np.ascontiguousarray(column)
+    block = shared_memory.SharedMemory(create=True, size=max(column.nbytes, 1))
+    np.ndarray(column.shape, dtype=column.dtype, buffer=block.buf)[:] = column
+    return block, (block.name, column.dtype.str, len(column))
+
+
+def _attach(layout, dvfs, base_energy_unit, cache_dir):
+    # Pool initializer: map every shared trace once per worker process
+    global _dvfs, _base_energy_unit, _cache
+    _dvfs = dvfs
+    _base_energy_unit = base_energy_unit
+    if cache_dir is not None:
+        _cache = ResultCache(max_bytes=0, directory=cache_dir)  # disk tier only, workers see one task per schedule
+    for name, columns in layout.items():
+        views = {}
+        for column, (block_name, dtype, length) in columns.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            _blocks.append(block)  # keep the mapping alive for the worker's lifetime
+            views[column] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        _traces[name] = views
+
+
+def _run_task(task):
+    name, algorithm, quantum = task
+    views = _traces[name]
+    table = ProcessTable(views["arrival"], views["burst"], views["priority"])
+
+    started = time.perf_counter()
+    if _cache is not None:
+        result = _cache.get_or_run(table, algorithm, lambda: VectorEngine.run(algorithm, table, quantum), quantum=quantum, aging=0)
+    else:
+        result = VectorEngine.run(algorithm, table, quantum)
+    seconds = time.perf_counter() - started
+
+    rows = []
+    for threshold, low_factor, high_factor in _dvfs:
+        rows.append({
+            "trace": name,
+            "algorithm": algorithm,
+            "quantum": quantum if quantum is not None else "",
+            "threshold": threshold,
+            "low_factor": low_factor,
+            "high_factor": high_factor,
+            "processes": len(table),
+            "avg_waiting": result.avg_waiting,
+            "avg_turnaround": result.avg_turnaround,
+            "energy": VectorEngine.energy(table.burst, _base_energy_unit, threshold, low_factor, high_factor),
+            "seconds": seconds,
+        })
+    return rows
+
+
+def write_results(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep scheduling algorithms and DVFS settings over job traces.")
+    parser.add_argument("traces", nargs="+", help="CSV (.csv) or binary trace files")
+    parser.add_argument("--algorithms", nargs="+", default=list(SchedulingEngine.ALGORITHMS), choices=SchedulingEngine.ALGORITHMS)
+    parser.add_argument("--quanta", nargs="+", type=int, default=[2], help="Round Robin time quanta")
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[5], help="DVFS burst thresholds")
+    parser.add_argument("--low-factors", nargs="+", type=float, default=[0.8], help="energy factors for bursts above the threshold")
+    parser.add_argument("--high-factors", nargs="+", type=float, default=[1.2], help="energy factors for bursts at or below the threshold")
+    parser.add_argument("--base-energy", type=float, default=1.5, help="base energy per cycle")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep_results.csv")
+    parser.add_argument("--cache", metavar="DIR", help="keep schedules in this directory and reuse them on later sweeps")
+    args = parser.parse_args()
+
+    if any(q <= 0 for q in args.quanta):
+        parser.error("Time quantum must be positive.")
+
+    traces = {path: TraceLoader.load(path) for path in args.traces}
+    started = time.perf_counter()
+    rows = sweep(traces, args.algorithms, args.quanta, args.thresholds, args.low_factors, args.high_factors,
+                 args.base_energy, args.workers, args.cache)
+    write_results(args.out, rows)
+    print(f"Wrote {len(rows)} configurations to {args.out} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import PowerModel
+import SchedulingEngine
+import VectorEngine
+from VectorEngine import ProcessTable
+
+# Benchmarks for every scheduling policy and the energy model over reproducible
+# synthetic workloads, with an optional stored baseline to catch regressions.
+
+WORKLOADS = ("poisson", "heavy_tailed", "bursty")
+CASES = SchedulingEngine.ALGORITHMS + ("Energy", "DVFS")
+
+
+def generate(kind, n, seed=0, load=0.9, mean_burst=10):
+    # Same (kind, n, seed) always yields the same trace
+    rng = np.random.default_rng(seed)
+    rate = load / mean_burst  # arrivals per time unit for the requested utilisation
+
+    if kind == "poisson":
+        gaps = rng.exponential(1 / rate, n)
+        burst = rng.geometric(1 / mean_burst, n)
+    elif kind == "heavy_tailed":
+        # Pareto bursts (alpha 1.5) rescaled to the same mean: most jobs short, a few huge
+        alpha = 1.5
+        gaps = rng.exponential(1 / rate, n)
+        burst = np.ceil((rng.pareto(alpha, n) + 1) * mean_burst * (alpha - 1) / alpha)
+    elif kind == "bursty":
+        # Back-to-back arrival bursts separated by long idle gaps
+        gaps = rng.exponential(mean_burst / 4, n)
+        burst_starts = rng.random(n) < 0.01
+        gaps[burst_starts] += rng.exponential(mean_burst * 1000, int(burst_starts.sum()))
+        burst = rng.geometric(1 / mean_burst, n)
+    else:
+        raise ValueError(f"Unknown workload: {kind}")
+
+    arrival = np.floor(np.cumsum(gaps)).astype(np.int64)
+    priority = rng.integers(0, 10, n)
+    return ProcessTable(arrival, burst.astype(np.int64), priority)
+
+
+def run_case(case, table, quantum):
+    if case == "Energy":
+        return VectorEngine.energy(table.burst)
+    if case == "DVFS":
+        return PowerModel.energy_aware(table, PowerModel.PowerModel.default(), slowdown=1.5)
+    return VectorEngine.run(case, table, quantum)
+
+
+def measure(case, table, quantum=2, repeat=5, memory=True):
+    wall = min(_timed(case, table, quantum) for _ in range(repeat))
+
+    peak = None
+    if memory:
+        # Traced separately: tracemalloc slows Python-heavy engines down noticeably
+        tracemalloc.start()
+        try:
+            run_case(case, table, quantum)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"wall": wall, "throughput": len(table) / wall if wall > 0 else float("inf"), "peak_bytes": peak}
+
+
+def _timed(case, table, quantum):
+    started = time.perf_counter()
+    run_case(case, table, quantum)
+    return time.perf_counter() - started
+
+
+def benchmark(cases=CASES, workloads=WORKLOADS, sizes=(10, 1000, 100000), quantum=2, seed=0, repeat=5, memory=True):
+    results = {}
+    print(f"{'case/workload/n':<44} {'wall':>11} {'throughput':>21} {'peak':>12}")
+    for kind in workloads:
+        for n in sizes:
+            table = generate(kind, n, seed)
+            for case in cases:
+                key = f"{case}/{kind}/{n}"
+                results[key] = measure(case, table, quantum, repeat, memory)
+                print(_format_row(key, results[key]), flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance=1.5, min_wall=0.005):
+    # Keys whose wall time grew by at least `tolerance`x over the baseline. Runs
+    # under `min_wall` seconds in the baseline are timer and scheduler noise, so
+    # they are not compared.
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or previous["wall"] < min_wall:
+            continue
+        ratio = current["wall"] / previous["wall"]
+        if ratio >= tolerance:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path, results, quantum, seed):
+    with open(path, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "quantum": quantum,
+            "seed": seed,
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+
+
+def _format_row(key, result):
+    peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 2**20:.1f} MiB"
+    return f"{key:<44} {result['wall']:>10.4f}s {result['throughput']:>14,.0f} proc/s {peak:>12}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling policies and the energy model.")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=WORKLOADS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 1000, 100000])
+    parser.add_argument("--quantum", type=int, default=2, help="Round Robin time quantum")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="report the best of this many timed runs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    parser.add_argument("--baseline", help="compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="flag runs at least this many times slower than the baseline")
+    parser.add_argument("--min-wall", type=float, default=0.005,
+                        help="only compare cases that took at least this many seconds in the baseline")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as a new baseline JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.cases, args.workloads, args.sizes, args.quantum, args.seed, args.repeat, not args.no_memory)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, args.quantum, args.seed)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance, args.min_wall)
+        for key, ratio in regressions:
+            print(f"REGRESSION {key}: {ratio:.2f}x slower than baseline")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,44 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import filedialog, messagebox
+
 import numpy as np
 
+import PowerModel
+import Timeline
+import TraceLoader
+from ResultCache import ResultCache
+from ResultsView import ResultsView
+from RunQueue import RunQueue
+from VectorEngine import ProcessTable
+
 class EnergyEfficientScheduler:
     def __init__(self, root):
         self.root = root
         self.root.title("Energy Efficient CPU Scheduling")
         
-        self.processes = []
+        self.num_processes = 0
+        self.results_frame = None
+        self.power_model = PowerModel.PowerModel.default()
         
         tk.Label(root, text="Number of Processes:").grid(row=0, column=0)
         self.num_processes_entry = tk.Entry(root)
         self.num_processes_entry.grid(row=0, column=1)
         
         tk.Button(root, text="Enter", command=self.get_process_details).grid(row=0, column=2)
+        tk.Button(root, text="Load Trace...", command=self.load_trace).grid(row=0, column=3)
+        
+        # How far each burst may stretch below the top frequency to save energy
+        tk.Label(root, text="Max Slowdown:").grid(row=0, column=4)
+        self.slowdown_entry = tk.Entry(root, width=6)
+        self.slowdown_entry.insert(0, "1.5")
+        self.slowdown_entry.grid(row=0, column=5)
+        
+        # Scheduling runs on a background worker; Cancel stops the run in progress
+        tk.Button(root, text="Cancel", command=self.cancel_scheduling).grid(row=0, column=6)
+        self.status_label = tk.Label(root, text="Idle")
+        self.status_label.grid(row=0, column=7)
+        self.runs = RunQueue(root, on_status=lambda status: self.status_label.config(text=status))
+        self.cache = ResultCache()
         
     def get_process_details(self):
         try:
@@ -44,52 +67,78 @@ class EnergyEfficientScheduler:
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number of processes.")
     
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Load Job Trace", filetypes=[("Job traces", "*.csv *.bin"), ("All files", "*")])
+        if not path:
+            return
+        
+        self.runs.submit("trace loading", lambda progress: self.read_trace(path), self.schedule_table, self.show_error)
+    
+    def read_trace(self, path):
+        # Runs on the worker thread
+        table = TraceLoader.load(path)
+        if len(table) == 0:
+            raise ValueError("Trace contains no jobs.")
+        return table
+    
     def schedule_processes(self):
-        self.processes = []
+        arrival_times = []
+        burst_times = []
         
-        for i, entries in enumerate(self.process_entries):
+        for entries in self.process_entries:
             try:
-                arrival_time = int(entries[0].get())
-                burst_time = int(entries[1].get())
-                self.processes.append((i+1, arrival_time, burst_time))
+                arrival_times.append(int(entries[0].get()))
+                burst_times.append(int(entries[1].get()))
             except ValueError:
                 messagebox.showerror("Error", "Please enter valid numerical values.")
                 return
         
-        self.processes.sort(key=lambda x: (x[1], x[2]))
-        self.calculate_scheduling()
-        self.display_results()
+        self.schedule_table(ProcessTable(arrival_times, burst_times))
     
-    def calculate_scheduling(self):
-        self.waiting_times = {}
-        self.turnaround_times = {}
-        self.completion_times = {}
-        self.energy_consumption = 0
-        
-        time = 0
-        base_energy_unit = 1.5  # Base energy per cycle
-        
-        for pid, arrival, burst in self.processes:
-            start_time = max(time, arrival)
-            waiting_time = start_time - arrival
-            turnaround_time = waiting_time + burst
-            completion_time = start_time + burst
-            
-            self.waiting_times[pid] = waiting_time
-            self.turnaround_times[pid] = turnaround_time
-            self.completion_times[pid] = completion_time
-            
-            dynamic_energy = base_energy_unit * (0.8 if burst > 5 else 1.2)  # DVFS-based energy scaling
-            self.energy_consumption += burst * dynamic_energy
-            
-            time = completion_time
+    def schedule_table(self, table):
+        try:
+            slowdown = float(self.slowdown_entry.get())
+            if slowdown < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Max slowdown must be a number of at least 1.")
+            return
         
-        self.avg_waiting_time = sum(self.waiting_times.values()) / len(self.processes)
-        self.avg_turnaround_time = sum(self.turnaround_times.values()) / len(self.processes)
+        self.runs.submit(f"{len(table)} processes", lambda progress: self.calculate_scheduling(table, slowdown, progress),
+                         self.display_results, self.show_error)
+    
+    def calculate_scheduling(self, table, slowdown, progress):
+        # Runs on the worker thread: computes only, never touches widgets.
+        # progress() raises once the run is cancelled, so it is checked between stages too
+        # Sort by arrival time, then burst time; pids keep the 1-based input position
+        order = np.lexsort((table.burst, table.arrival))
+        table = table.take(order)
+        progress(0, len(table))
+        # Per-process frequencies chosen to minimise energy within the slowdown bound;
+        # rescheduling an unchanged workload with the same settings is a cache hit
+        model = self.power_model
+        dvfs = self.cache.get_or_run(table, "DVFS", lambda: PowerModel.energy_aware(table, model, slowdown=slowdown, progress=progress),
+                                     slowdown=slowdown, pstates=tuple(model.pstates), idle_power=model.idle_power)
+        progress(len(table), len(table))
+        return order + 1, table, dvfs, dvfs.schedule.metrics()
+    
+    def cancel_scheduling(self):
+        self.runs.cancel()
+    
+    def show_error(self, error):
+        messagebox.showerror("Error", str(error))
     
-    def display_results(self):
-        # Frame for results
-        results_frame = tk.Frame(self.root)
+    def display_results(self, outcome):
+        self.pids, self.table, self.dvfs, self.metrics = outcome
+        self.result = self.dvfs.schedule
+        self.energy_consumption = self.dvfs.energy
+        self.avg_waiting_time = self.result.avg_waiting
+        self.avg_turnaround_time = self.result.avg_turnaround
+        
+        # Frame for results; the previous run's frame (and its figure canvas) is destroyed first
+        if self.results_frame is not None:
+            self.results_frame.destroy()
+        results_frame = self.results_frame = tk.Frame(self.root)
         results_frame.grid(row=self.num_processes+3, column=0, columnspan=3, pady=10)
 
         # Show average times
@@ -97,9 +146,16 @@ class EnergyEfficientScheduler:
         avg_label.grid(row=0, column=0, padx=10)
 
         # Show total energy consumption
-        energy_label = tk.Label(results_frame, text=f"Total Energy Consumption: {self.energy_consumption:.2f} units")
+        energy_label = tk.Label(results_frame, text=f"Total Energy Consumption: {self.energy_consumption:.2f} units (idle: {self.dvfs.idle_energy:.2f})")
         energy_label.grid(row=0, column=1, padx=10)
 
+        # Tail latency, utilization and fairness
+        m = self.metrics
+        metrics_label = tk.Label(results_frame, text=f"Waiting p95/p99/p99.9: {m['p95_waiting']:.2f} / {m['p99_waiting']:.2f} / {m['p99.9_waiting']:.2f} | "
+                                                     f"Avg Slowdown: {m['avg_slowdown']:.2f} | Utilization: {m['utilization']:.0%} | "
+                                                     f"Context Switches: {m['context_switches']} | Fairness: {m['fairness']:.3f}")
+        metrics_label.grid(row=1, column=0, columnspan=2, padx=10)
+
         # Display the Gantt Chart
         self.display_gantt_chart(results_frame)
 
@@ -107,37 +163,39 @@ class EnergyEfficientScheduler:
         self.display_results_table(results_frame)
     
     def display_gantt_chart(self, frame):
-        fig, ax = plt.subplots(figsize=(8, 2))
-        start_time = 0
-        
-        colors = plt.cm.get_cmap("tab10", len(self.processes))
+        # Plotting stack is only needed once there is something to draw
+        # A bare Figure is owned by its canvas, so it goes away with the results frame
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8, 2))
+        ax = fig.add_subplot()
         
-        for i, (pid, arrival, burst) in enumerate(self.processes):
-            start_time = max(start_time, arrival)
-            ax.barh("Process", burst, left=start_time, color=colors(i), label=f"P{pid}")
-            start_time += burst
+        # Bars are labelled in place where they are wide enough, instead of a legend entry per process
+        Timeline.draw(ax, self.result.slices, names=self.pids)
         
+        ax.set_yticklabels(["Process"])
         ax.set_xlabel("Time")
         ax.set_title("Gantt Chart - Energy Efficient Scheduling")
-        ax.legend()
         ax.grid(True, linestyle='--', alpha=0.6)
         
         canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.get_tk_widget().grid(row=1, column=0, columnspan=3, pady=10)
+        canvas.get_tk_widget().grid(row=2, column=0, columnspan=3, pady=10)
         canvas.draw()
     
     def display_results_table(self, frame):
-        columns = ("Process", "Arrival Time", "Burst Time", "Completion Time", "Turnaround Time", "Waiting Time")
-        tree = ttk.Treeview(frame, columns=columns, show='headings')
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=100)
-        
-        for pid, arrival, burst in self.processes:
-            tree.insert("", tk.END, values=(pid, arrival, burst, self.completion_times[pid], self.turnaround_times[pid], self.waiting_times[pid]))
-        
-        tree.grid(row=2, column=0, columnspan=3, pady=10, padx=10)
+        columns = {
+            "Process": self.pids,
+            "Arrival Time": self.table.arrival,
+            "Burst Time": self.table.burst,
+            "Frequency": self.dvfs.frequency,
+            # Burst stretched by the chosen frequency; waiting is turnaround minus this
+            "Execution Time": self.table.burst * self.power_model.scale[self.dvfs.states],
+            "Completion Time": self.result.completion,
+            "Turnaround Time": self.result.turnaround,
+            "Waiting Time": self.result.waiting,
+        }
+        ResultsView(frame, columns, formats={"Frequency": "{:g}"}).grid(row=3, column=0, columnspan=3, pady=10, padx=10)
 
 if __name__ == "__main__":
     root = tk.Tk()
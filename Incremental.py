@@ -0,0 +1,360 @@
+import argparse
+import random
+
+import numpy as np
+
+import SchedulingEngine
+import VectorEngine
+from SchedulingEngine import ScheduleResult
+from VectorEngine import SliceColumns
+
+# Incremental rescheduling for what-if edits on a large workload.
+#
+# Jobs are kept sorted by (arrival, pid) together with their FCFS completion
+# times. Editing one job only changes FCFS completions from its position on,
+# and only until a recomputed completion equals the stored one; from there the
+# CPU is in exactly the state it was before, so the rest of the suffix is
+# unchanged and the recompute stops.
+#
+# The FCFS completions also give the busy periods (a new one starts wherever a
+# job arrives strictly after the previous completion; a job arriving right as
+# the CPU frees up, e.g. behind a zero-length burst with the same arrival time,
+# may tie with the jobs before it, so it stays in their period). Busy periods do not depend
+# on the policy, and a work-conserving policy schedules each one using only its
+# own jobs, so SJF, Priority and Round Robin rerun just the busy periods that
+# overlap the changed FCFS range. Busy periods are also disjoint in time, so
+# Round Robin keeps one time-ordered set of slice columns and a rerun replaces
+# the contiguous run of slices between its neighbouring periods.
+
+ALGORITHMS = ("FCFS", "SJF", "Priority", "Round Robin")
+
+_SCAN = 4096
+
+
+class IncrementalSchedule:
+    def __init__(self, algorithm, table, quantum=None, progress=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Incremental scheduling does not support {algorithm}")
+        if algorithm == "Round Robin" and (quantum is None or quantum <= 0):
+            raise ValueError("Time quantum must be positive.")
+        self.algorithm = algorithm
+        self.quantum = quantum
+        n = len(table)
+
+        # Per-pid columns; pids are input positions, new jobs get the next free one
+        dtype = np.result_type(table.arrival, table.burst)
+        self.job_arrival = table.arrival.astype(dtype)
+        self.job_burst = table.burst.astype(dtype)
+        self.job_priority = table.priority.copy()
+        self.alive = np.ones(n, dtype=bool)
+        self.count = n
+
+        # Arrival-sorted columns with their FCFS completions
+        self.pid = np.argsort(table.arrival, kind="stable")
+        self.arrival = self.job_arrival[self.pid]
+        self.burst = self.job_burst[self.pid]
+        self.fcfs = VectorEngine.fcfs_completion(self.arrival, self.burst, progress=progress)
+
+        self.total_arrival = self.arrival.sum().item()
+        self.total_burst = self.burst.sum().item()
+        self.energy = VectorEngine.energy(self.burst)
+
+        if algorithm == "FCFS":
+            self.total_completion = self.fcfs.sum().item()
+        else:
+            # Policy completions per pid; non-preemptive slices follow from them
+            self.done = np.zeros(n, dtype=dtype)
+            self.total_completion = 0
+            if algorithm == "Round Robin":
+                self.slice_pid = np.zeros(0, dtype=np.int64)
+                self.slice_start = np.zeros(0, dtype=dtype)
+                self.slice_end = np.zeros(0, dtype=dtype)
+            self._reschedule(0, n, progress)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def avg_turnaround(self):
+        return (self.total_completion - self.total_arrival) / self.count
+
+    @property
+    def avg_waiting(self):
+        return (self.total_completion - self.total_arrival - self.total_burst) / self.count
+
+    def pids(self):
+        # Live pids in the row order of result()
+        return np.flatnonzero(self.alive)
+
+    def insert(self, arrival, burst, priority=0):
+        self._fit(arrival, burst)
+        pid = len(self.alive)
+        self._grow(pid + 1)
+        self.job_arrival[pid] = arrival
+        self.job_burst[pid] = burst
+        self.job_priority[pid] = priority
+        self.alive[pid] = True
+        self._place(pid)
+        return pid
+
+    def delete(self, pid):
+        self._check(pid)
+        p = self._position(pid)
+        self._account(self.arrival[p], self.burst[p], -1)
+        if self.algorithm == "FCFS":
+            self.total_completion -= self.fcfs[p].item()
+        else:
+            self.total_completion -= self.done[pid].item()
+
+        self.pid = np.delete(self.pid, p)
+        self.arrival = np.delete(self.arrival, p)
+        self.burst = np.delete(self.burst, p)
+        self.fcfs = np.delete(self.fcfs, p)
+        self.alive[pid] = False
+
+        # The job after it is unchanged, so the early stop may fire right at p.
+        # The window ends at a period start whose predecessor kept its completion
+        # (k + 1 or later): only that is a boundary before and after the edit.
+        k = self._refresh(p)
+        if self.algorithm != "FCFS":
+            self._reschedule(self._period_start(max(p - 1, 0)), self._period_end(max(k + 1, p)))
+
+    def update(self, pid, arrival=None, burst=None, priority=None):
+        self._check(pid)
+        self._fit(arrival, burst)
+        self.delete(pid)
+        if arrival is not None:
+            self.job_arrival[pid] = arrival
+        if burst is not None:
+            self.job_burst[pid] = burst
+        if priority is not None:
+            self.job_priority[pid] = priority
+        self.alive[pid] = True
+        self._place(pid)
+
+    def sync(self, table, progress=None):
+        # Bring pids 0..n-1 in line with a table of the same length, one edit per
+        # changed row; progress(done, total) is called between edits
+        if len(table) != len(self.alive) or not self.alive.all():
+            raise ValueError("Table does not match the scheduled jobs.")
+        changed = np.flatnonzero((table.arrival != self.job_arrival) | (table.burst != self.job_burst) |
+                                 (table.priority != self.job_priority))
+        for done, pid in enumerate(changed.tolist()):
+            if progress is not None:
+                progress(done, len(changed))
+            self.update(pid, table.arrival[pid], table.burst[pid], table.priority[pid])
+        return len(changed)
+
+    def result(self):
+        # Materialize a ScheduleResult over the live jobs, in pid order
+        pids = self.pids()
+        arrival = self.job_arrival[pids]
+        burst = self.job_burst[pids]
+        local = np.searchsorted(pids, self.pid)  # row of each arrival-sorted job
+
+        if self.algorithm == "FCFS":
+            completion = np.empty_like(self.fcfs)
+            completion[local] = self.fcfs
+            slices = SliceColumns(local, self.fcfs - self.burst, self.fcfs)
+        elif self.algorithm == "Round Robin":
+            completion = self.done[pids]
+            slices = SliceColumns(np.searchsorted(pids, self.slice_pid), self.slice_start, self.slice_end)
+        else:
+            # Non-preemptive: one slice per job, in start order. Only zero-length
+            # slices share a start; those were dispatched in ready-queue order.
+            completion = self.done[pids]
+            start = completion - burst
+            rank = burst if self.algorithm == "SJF" else self.job_priority[pids]
+            order = np.lexsort((pids, arrival, rank, completion, start))
+            slices = SliceColumns(order, start[order], completion[order])
+
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        return ScheduleResult(self.algorithm, arrival, burst, completion, turnaround, waiting, slices, self.energy)
+
+    def _check(self, pid):
+        if not (0 <= pid < len(self.alive) and self.alive[pid]):
+            raise ValueError(f"No job with pid {pid}.")
+
+    def _fit(self, *values):
+        # Fractional times switch the integer columns to float64 instead of truncating
+        if self.fcfs.dtype.kind == "f" or all(v is None or float(v).is_integer() for v in values):
+            return
+        for name in ("job_arrival", "job_burst", "arrival", "burst", "fcfs", "done", "slice_start", "slice_end"):
+            if hasattr(self, name):
+                setattr(self, name, getattr(self, name).astype(np.float64))
+
+    def _grow(self, size):
+        if size <= len(self.alive):
+            return
+        extra = size - len(self.alive)
+        self.job_arrival = np.append(self.job_arrival, np.zeros(extra, dtype=self.job_arrival.dtype))
+        self.job_burst = np.append(self.job_burst, np.zeros(extra, dtype=self.job_burst.dtype))
+        self.job_priority = np.append(self.job_priority, np.zeros(extra, dtype=self.job_priority.dtype))
+        self.alive = np.append(self.alive, np.zeros(extra, dtype=bool))
+        if self.algorithm != "FCFS":
+            self.done = np.append(self.done, np.zeros(extra, dtype=self.done.dtype))
+
+    def _position(self, pid):
+        # Sorted position of a live pid: ties on arrival are ordered by pid
+        a = self.job_arrival[pid]
+        lo = np.searchsorted(self.arrival, a, side="left")
+        hi = np.searchsorted(self.arrival, a, side="right")
+        return lo + np.searchsorted(self.pid[lo:hi], pid)
+
+    def _place(self, pid):
+        # Insert a live pid into the sorted columns and fix up what it affects
+        a = self.job_arrival[pid]
+        b = self.job_burst[pid]
+        p = self._position(pid)
+        time = self.fcfs[p - 1] if p > 0 else 0
+        end = max(time, a) + b
+
+        self.pid = np.insert(self.pid, p, pid)
+        self.arrival = np.insert(self.arrival, p, a)
+        self.burst = np.insert(self.burst, p, b)
+        self.fcfs = np.insert(self.fcfs, p, end)
+        self._account(a, b, 1)
+        if self.algorithm == "FCFS":
+            self.total_completion += end.item()
+
+        k = self._refresh(p + 1)
+        if self.algorithm != "FCFS":
+            self.done[pid] = 0
+            self._reschedule(self._period_start(max(p - 1, 0)), self._period_end(k + 1))
+
+    def _account(self, arrival, burst, sign):
+        self.count += sign
+        self.total_arrival += sign * arrival.item()
+        self.total_burst += sign * burst.item()
+        self.energy += sign * SchedulingEngine.energy([burst.item()])
+
+    def _refresh(self, p):
+        # Recompute FCFS completions from sorted position p until one matches its
+        # stored value; returns the first position that was left untouched
+        n = len(self.fcfs)
+        time = self.fcfs[p - 1] if p > 0 else 0
+        step = 64
+        while p < n:
+            hi = min(p + step, n)
+            new = np.empty(hi - p, dtype=self.fcfs.dtype)
+            VectorEngine._fcfs_chunk(self.arrival[p:hi], self.burst[p:hi], time, new)
+            same = np.flatnonzero(new == self.fcfs[p:hi])
+            stop = hi if len(same) == 0 else p + same[0]
+            if self.algorithm == "FCFS":
+                self.total_completion += (new[:stop - p] - self.fcfs[p:stop]).sum().item()
+            self.fcfs[p:stop] = new[:stop - p]
+            if stop < hi:
+                return stop
+            time = new[-1]
+            p = hi
+            step *= 2
+        return n
+
+    def _period_start(self, p):
+        # Sorted position where the busy period containing p begins
+        while p > 0:
+            lo = max(p - _SCAN, 0)
+            # boundary j (lo < j <= p) where arrival[j] > fcfs[j - 1]
+            starts = np.flatnonzero(self.arrival[lo + 1:p + 1] > self.fcfs[lo:p])
+            if len(starts):
+                return lo + 1 + starts[-1]
+            p = lo
+        return 0
+
+    def _period_end(self, p):
+        # First busy-period start at or after sorted position p (n if none)
+        n = len(self.fcfs)
+        p = max(p, 1)
+        while p < n:
+            hi = min(p + _SCAN, n)
+            starts = np.flatnonzero(self.arrival[p:hi] > self.fcfs[p - 1:hi - 1])
+            if len(starts):
+                return p + starts[0]
+            p = hi
+        return n
+
+    def _reschedule(self, lo, hi, progress=None):
+        # Rerun the policy over whole busy periods [lo, hi) of the sorted columns
+        if lo >= hi and self.algorithm != "Round Robin":
+            return
+        pids = np.sort(self.pid[lo:hi])  # input order decides ties, as in a full run
+        arrival = self.job_arrival[pids].tolist()
+        burst = self.job_burst[pids].tolist()
+        if self.algorithm == "SJF":
+            result = SchedulingEngine.sjf(arrival, burst, progress)
+        elif self.algorithm == "Priority":
+            result = SchedulingEngine.priority(arrival, burst, self.job_priority[pids].tolist(), progress)
+        else:
+            result = SchedulingEngine.round_robin(arrival, burst, self.quantum, progress)
+
+        self.total_completion += sum(result.completion) - self.done[pids].sum().item()
+        self.done[pids] = result.completion
+        if self.algorithm == "Round Robin":
+            self._splice(lo, hi, pids, SliceColumns.from_slices(result.slices))
+
+    def _splice(self, lo, hi, pids, new):
+        # Jobs before lo finish by arrival[lo] and jobs from hi on start at
+        # arrival[hi], before and after the edit alike, so the window's old
+        # slices (an edited or deleted job's included) are exactly those between
+        n = len(self.arrival)
+        left = 0 if lo == 0 else np.searchsorted(self.slice_start, self.arrival[lo], side="left")
+        right = len(self.slice_start) if hi >= n else np.searchsorted(self.slice_start, self.arrival[hi], side="left")
+        dtype = self.slice_start.dtype
+        self.slice_pid = np.concatenate((self.slice_pid[:left], pids[new.pid], self.slice_pid[right:]))
+        self.slice_start = np.concatenate((self.slice_start[:left], new.start.astype(dtype), self.slice_start[right:]))
+        self.slice_end = np.concatenate((self.slice_end[:left], new.end.astype(dtype), self.slice_end[right:]))
+
+def verify(sequences=1500, edits=12, seed=0):
+    # Random insert/delete/update sequences (zero and fractional times included)
+    # must leave every policy's schedule identical to a full rerun
+    rng = random.Random(seed)
+    failures = 0
+    for sequence in range(sequences):
+        n = 1 + sequence % 10
+        arrival = [rng.randint(0, 25) for _ in range(n)]
+        burst = [rng.randint(0, 7) for _ in range(n)]
+        priority = [rng.randint(0, 3) for _ in range(n)]
+        for algorithm in ALGORITHMS:
+            schedule = IncrementalSchedule(algorithm, VectorEngine.ProcessTable(arrival, burst, priority), quantum=2)
+            for _ in range(edits):
+                live = schedule.pids().tolist()
+                op = rng.random()
+                if op < 0.35 or not live:
+                    schedule.insert(rng.randint(0, 30) + rng.choice([0, 0, 0, 0.5]), rng.randint(0, 7), rng.randint(0, 3))
+                elif op < 0.6:
+                    schedule.delete(rng.choice(live))
+                else:
+                    schedule.update(rng.choice(live), arrival=rng.choice([None, rng.randint(0, 30)]),
+                                    burst=rng.choice([None, rng.randint(0, 7)]), priority=rng.randint(0, 3))
+                if len(schedule) and not _matches(schedule):
+                    failures += 1
+                    print(f"Mismatch: {algorithm}, sequence {sequence}")
+                    break
+    return failures
+
+
+def _matches(schedule):
+    pids = schedule.pids()
+    arrival = schedule.job_arrival[pids].tolist()
+    burst = schedule.job_burst[pids].tolist()
+    priority = schedule.job_priority[pids].tolist()
+    full = SchedulingEngine.run(schedule.algorithm, arrival, burst, priority, schedule.quantum)
+    result = schedule.result()
+    return (list(result.completion) == list(full.completion) and
+            [tuple(s) for s in result.slices] == [tuple(s) for s in full.slices])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check incremental edits against full reruns of every policy.")
+    parser.add_argument("--sequences", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    failures = verify(args.sequences, seed=args.seed)
+    print(f"{failures} of {args.sequences * len(ALGORITHMS)} edit sequences diverged from a full rerun")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import cProfile
+import json
+import pstats
+import time
+
+# Opt-in instrumentation for the scheduling loops.
+#
+# The engines take probe=None. Given a Probe they count what happens in their
+# event loops and time each phase of a run; every touch of the probe sits
+# behind an `if probe is not None` check, so an uninstrumented run pays one
+# comparison per event and nothing else.
+#
+#   events          dispatches: a process given the CPU
+#   idle_jumps      times the CPU was idle and time jumped to the next arrival
+#   idle_time       simulated time skipped by those jumps
+#   queue_pushes    ready-queue insertions (admissions and requeues)
+#   queue_pops      ready-queue removals
+#   max_ready       largest ready set seen at a dispatch
+#   preemptions     processes put back on the ready queue before finishing
+#
+# Phases are "order" (sorting by arrival), "schedule" (the event loop) and
+# "result" (building the ScheduleResult), in seconds summed over runs.
+
+COUNTERS = ("events", "idle_jumps", "idle_time", "queue_pushes", "queue_pops", "max_ready", "preemptions")
+
+
+class Probe:
+    def __init__(self):
+        self.runs = 0
+        self.events = 0
+        self.idle_jumps = 0
+        self.idle_time = 0
+        self.queue_pushes = 0
+        self.queue_pops = 0
+        self.max_ready = 0
+        self.preemptions = 0
+        self.phases = {}
+        self.profiler = None
+        self._mark = None
+
+    def start(self):
+        self.runs += 1
+        self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        # Charge the time since the previous start/lap to `phase`
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def dispatch(self, ready):
+        # A process is about to be taken off a ready set of `ready` entries
+        self.events += 1
+        self.queue_pops += 1
+        if ready > self.max_ready:
+            self.max_ready = ready
+
+    def idle(self, gap):
+        self.idle_jumps += 1
+        self.idle_time += gap
+
+    def report(self):
+        report = {name: getattr(self, name) for name in COUNTERS}
+        report["runs"] = self.runs
+        report["phases"] = dict(self.phases)
+        return report
+
+    def to_json(self, path=None):
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+        return text
+
+    def profile(self, fn, *args, **kwargs):
+        # Run fn under cProfile; repeated calls add to the same profile
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.profiler.disable()
+
+    def stats(self, sort="cumulative"):
+        if self.profiler is None:
+            raise ValueError("Nothing has been profiled yet.")
+        return pstats.Stats(self.profiler).sort_stats(sort)
+
+    def dump_stats(self, path):
+        # Readable by pstats, snakeviz, gprof2dot and friends
+        self.stats().dump_stats(path)
+
+
+def main():
+    # Benchmark is imported here: it pulls in NumPy and the power model
+    import Benchmark
+    import SchedulingEngine
+    import VectorEngine
+
+    parser = argparse.ArgumentParser(description="Run one policy on a synthetic workload with instrumentation on.")
+    parser.add_argument("--algorithm", default="Round Robin", choices=SchedulingEngine.ALGORITHMS)
+    parser.add_argument("--workload", default="poisson", choices=Benchmark.WORKLOADS)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--quantum", type=int, default=2, help="Round Robin time quantum")
+    parser.add_argument("--aging", type=float, default=0, help="aging rate for Priority (Preemptive)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="write the counter and phase report here")
+    parser.add_argument("--pstats", metavar="PATH", help="also profile the run and dump cProfile stats here")
+    parser.add_argument("--top", type=int, default=15, help="profile lines to print with --pstats")
+    args = parser.parse_args()
+
+    table = Benchmark.generate(args.workload, args.size, args.seed)
+    probe = Probe()
+    if args.pstats:
+        probe.profile(VectorEngine.run, args.algorithm, table, args.quantum, args.aging, probe=probe)
+        probe.dump_stats(args.pstats)
+        probe.stats().print_stats(args.top)
+    else:
+        VectorEngine.run(args.algorithm, table, args.quantum, args.aging, probe=probe)
+
+    text = probe.to_json(args.json)
+    print(text if args.json is None else f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
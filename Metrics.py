@@ -0,0 +1,209 @@
+import math
+
+import numpy as np
+
+import SchedulingEngine
+import VectorEngine
+
+# Constant-memory statistics for long or unbounded job streams.
+#
+# QuantileSketch keeps logarithmically sized buckets (as in DDSketch): every
+# quantile it reports is within `accuracy` relative error of a true sample
+# value, and the number of buckets grows with the log of the value range, not
+# with the number of samples.
+#
+# RunningStats accumulates everything reported for a schedule in one pass over
+# its jobs, one at a time (online mode) or a chunk of columns at a time:
+#   waiting / turnaround / response time   mean and percentiles
+#   slowdown                               turnaround / burst, mean and percentiles
+#   utilization                            busy time / (cores x span from first arrival to last completion)
+#   context switches                       dispatches of a different process than the one that ran before
+#   fairness                               Jain's index over burst / turnaround (1 = every job slowed equally)
+
+QUANTILES = (0.5, 0.95, 0.99, 0.999)
+CHUNK_SIZE = 1 << 20
+
+
+class QuantileSketch:
+    def __init__(self, accuracy=0.01):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # bucket index -> count, bucket i covers (gamma^(i-1), gamma^i]
+        self.zeros = 0  # samples <= 0 (waiting times are never negative)
+        self.count = 0
+
+    def add(self, value, weight=1):
+        self.count += weight
+        if value <= 0:
+            self.zeros += weight
+            return
+        i = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[i] = self.buckets.get(i, 0) + weight
+
+    def add_many(self, values):
+        # Vectorised add of an array of samples
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values > 0]
+        self.count += len(values)
+        self.zeros += len(values) - len(positive)
+        if len(positive) == 0:
+            return
+        index = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+        low = index.min().item()
+        counts = np.bincount(index - low)
+        for offset in np.flatnonzero(counts).tolist():
+            i = low + offset
+            self.buckets[i] = self.buckets.get(i, 0) + counts[offset].item()
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same accuracy can be merged.")
+        self.count += other.count
+        self.zeros += other.zeros
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if rank < seen:
+                return 2 * self.gamma ** i / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RunningStats:
+    # Energy uses the engine's DVFS rule, with the same parameters
+    def __init__(self, accuracy=0.01, base_energy_unit=1.5, threshold=5, low_factor=0.8, high_factor=1.2, cores=1):
+        self.count = 0
+        self.cores = cores
+        self.totals = {"waiting": 0, "turnaround": 0, "response": 0, "slowdown": 0.0}
+        self.sketches = {name: QuantileSketch(accuracy) for name in self.totals}
+        self.busy = 0
+        self.first_arrival = None
+        self.last_completion = None
+        self.context_switches = 0
+        self.share = 0.0  # sum of burst / turnaround, for Jain's index
+        self.share_squares = 0.0
+        self.energy = 0.0
+        self.energy_params = (base_energy_unit, threshold, low_factor, high_factor)
+
+    def add(self, arrival, burst, completion, first_start=None):
+        # One finished job; first_start defaults to run-to-completion (response = waiting)
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        response = waiting if first_start is None else first_start - arrival
+        slowdown = turnaround / burst if burst > 0 else 1.0
+        share = burst / turnaround if turnaround > 0 else 1.0
+
+        self.count += 1
+        for name, value in (("waiting", waiting), ("turnaround", turnaround), ("response", response), ("slowdown", slowdown)):
+            self.totals[name] += value
+            self.sketches[name].add(value)
+        self.busy += burst
+        self.share += share
+        self.share_squares += share * share
+        if self.first_arrival is None or arrival < self.first_arrival:
+            self.first_arrival = arrival
+        if self.last_completion is None or completion > self.last_completion:
+            self.last_completion = completion
+        self.energy += SchedulingEngine.work_energy(burst, burst, *self.energy_params)
+
+    def add_columns(self, arrival, burst, completion, first_start=None):
+        # A chunk of finished jobs as NumPy columns
+        if len(arrival) == 0:
+            return
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        response = waiting if first_start is None else first_start - arrival
+        positive = burst > 0
+        slowdown = np.divide(turnaround, burst, out=np.ones(len(burst)), where=positive)
+        share = np.divide(burst, turnaround, out=np.ones(len(burst)), where=turnaround > 0)
+
+        self.count += len(arrival)
+        for name, values in (("waiting", waiting), ("turnaround", turnaround), ("response", response), ("slowdown", slowdown)):
+            self.totals[name] += values.sum().item()
+            self.sketches[name].add_many(values)
+        self.busy += burst.sum().item()
+        self.share += share.sum().item()
+        self.share_squares += np.dot(share, share).item()
+        low = arrival.min().item()
+        high = completion.max().item()
+        self.first_arrival = low if self.first_arrival is None else min(self.first_arrival, low)
+        self.last_completion = high if self.last_completion is None else max(self.last_completion, high)
+        self.energy += VectorEngine.energy(burst, *self.energy_params)
+
+    def summary(self, quantiles=QUANTILES):
+        if self.count == 0:
+            return {"count": 0}
+        span = self.last_completion - self.first_arrival
+        summary = {
+            "count": self.count,
+            "utilization": self.busy / (self.cores * span) if span > 0 else 0.0,
+            "context_switches": self.context_switches,
+            "fairness": self.share * self.share / (self.count * self.share_squares) if self.share_squares else 1.0,
+            "energy": self.energy,
+        }
+        for name, total in self.totals.items():
+            summary[f"avg_{name}"] = total / self.count
+            for q in quantiles:
+                summary[f"p{q * 100:g}_{name}"] = self.sketches[name].quantile(q)
+        return summary
+
+
+def summarize(result, cores=1, slice_core=None, quantiles=QUANTILES, accuracy=0.01, chunk_size=CHUNK_SIZE):
+    # Metrics of a finished ScheduleResult in one pass over its slices and jobs.
+    # slice_core gives the core of each slice for multi-core runs.
+    n = len(result)
+    stats = RunningStats(accuracy, cores=cores)
+    first_start = np.zeros(n)
+    seen = np.zeros(n, dtype=bool)
+    last_pid = np.full(cores, -1)
+
+    slices = result.slices
+    columns = hasattr(slices, "pid")
+    for lo in range(0, len(slices), chunk_size):
+        if columns:
+            pid = np.asarray(slices.pid[lo:lo + chunk_size])
+            start = np.asarray(slices.start[lo:lo + chunk_size])
+        else:
+            chunk = slices[lo:lo + chunk_size]
+            pid = np.fromiter((s.pid for s in chunk), np.int64, len(chunk))
+            start = np.fromiter((s.start for s in chunk), np.float64, len(chunk))
+        core = np.zeros(len(pid), dtype=np.int64) if slice_core is None else np.asarray(slice_core[lo:lo + chunk_size])
+
+        # Slices are in time order, so a pid's first slice holds its first start
+        fresh = np.flatnonzero(~seen[pid])
+        fresh = fresh[np.unique(pid[fresh], return_index=True)[1]]
+        first_start[pid[fresh]] = start[fresh]
+        seen[pid[fresh]] = True
+
+        # A switch is a slice whose pid differs from the previous slice on the same core
+        order = np.argsort(core, kind="stable")
+        pid_by_core, core_sorted = pid[order], core[order]
+        previous = np.empty_like(pid_by_core)
+        previous[1:] = pid_by_core[:-1]
+        boundary = np.ones(len(order), dtype=bool)
+        boundary[1:] = core_sorted[1:] != core_sorted[:-1]
+        previous[boundary] = last_pid[core_sorted[boundary]]
+        stats.context_switches += int(np.count_nonzero((previous != pid_by_core) & (previous != -1)))
+        ends = np.flatnonzero(np.append(boundary[1:], True))
+        last_pid[core_sorted[ends]] = pid_by_core[ends]
+
+    for lo in range(0, n, chunk_size):
+        window = slice(lo, lo + chunk_size)
+        arrival = np.asarray(result.arrival[window])
+        completion = np.asarray(result.completion[window])
+        # Service time as the policy saw it: DVFS runs stretch bursts at lower frequencies
+        service = completion - arrival - np.asarray(result.waiting[window])
+        stats.add_columns(arrival, service, completion, first_start[window])
+
+    summary = stats.summary(quantiles)
+    summary["energy"] = result.energy  # the policy's own energy model, e.g. DVFS
+    return summary
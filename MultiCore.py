@@ -0,0 +1,232 @@
+import heapq
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+
+from SchedulingEngine import PROGRESS_EVERY, ScheduleResult, SliceLog, column, work_energy
+
+# Multi-core simulation of the FCFS, SJF, Priority and Round Robin policies.
+#
+# Cores are driven by a heap of (time, core) events. A core with nothing to run
+# is parked instead of polling, and at most one parked core waits for the next
+# arrival, so the cost stays O(n log n + n log cores) however many cores there are.
+#
+# Load balancing:
+#   "global"   - one shared ready queue for all cores
+#   "stealing" - per-core queues. An arrival goes to an idle core's queue
+#                (waking it) if there is one, otherwise round-robin over the
+#                cores. A core whose queue is empty steals from the most loaded
+#                queue, but never the one job an idle owner is about to run.
+
+ALGORITHMS = ("FCFS", "SJF", "Priority", "Round Robin")
+BALANCING = ("global", "stealing")
+
+
+@dataclass
+class MultiCoreResult:
+    schedule: ScheduleResult
+    cores: int
+    slice_core: list  # core that ran each slice in schedule.slices, as a typed array
+    busy: list = field(default_factory=list)  # busy time per core
+    utilization: list = field(default_factory=list)  # busy / makespan per core
+    energy: list = field(default_factory=list)  # energy per core
+    steals: int = 0
+
+    @property
+    def makespan(self):
+        return max(self.schedule.slices.end, default=0)
+
+    def metrics(self):
+        # Utilization over all cores; context switches counted per core
+        import Metrics
+        return Metrics.summarize(self.schedule, self.cores, self.slice_core)
+
+
+def simulate(algorithm, arrival, burst, priorities=None, cores=4, quantum=None, balancing="global",
+             base_energy_unit=1.5, threshold=5, low_factor=0.8, high_factor=1.2, progress=None):
+    if cores <= 0:
+        raise ValueError("Number of cores must be positive.")
+    if balancing not in BALANCING:
+        raise ValueError(f"Unknown load balancing mode: {balancing}")
+    if algorithm == "FCFS":
+        rank = arrival
+    elif algorithm == "SJF":
+        rank = burst
+    elif algorithm == "Priority":
+        rank = priorities if priorities is not None else [0] * len(arrival)
+    elif algorithm == "Round Robin":
+        if quantum is None or quantum <= 0:
+            raise ValueError("Time quantum must be positive.")
+        rank = None
+    else:
+        raise ValueError(f"Multi-core mode does not support {algorithm}")
+
+    n = len(arrival)
+    fifo = rank is None
+    stealing = balancing == "stealing"
+    order = sorted(range(n), key=arrival.__getitem__)
+    remaining = list(burst)
+    completion = [0] * n
+    slices = SliceLog()
+    slice_core = array("i")
+    last_slice = [None] * cores  # index of each core's latest slice, for merging RR quanta
+    running = [None] * cores
+
+    # Ready queues: FIFO for Round Robin, otherwise heaps on (rank, arrival, pid)
+    queues = [deque() if fifo else [] for _ in range(cores if stealing else 1)]
+    queued = 0
+    placement = 0
+    load = []  # lazy max-heap of (-queue length, core) for picking steal victims
+    steals = 0
+
+    events = [(0, c) for c in range(cores)]  # every core looks for work at t=0
+    waking = cores  # parked cores already scheduled to look for work
+    idle = []
+    waiter = None  # the one parked core that wakes at the next arrival
+    cursor = 0
+    completed = 0
+
+    def touch(core):
+        # Record a queue's new length; stale entries are skipped when stealing
+        if queues[core]:
+            heapq.heappush(load, (-len(queues[core]), core))
+        if len(load) > 8 * cores + 64:
+            load[:] = [(-len(q), i) for i, q in enumerate(queues) if q]
+            heapq.heapify(load)
+
+    def enqueue(core, pid):
+        if fifo:
+            queues[core].append(pid)
+        else:
+            heapq.heappush(queues[core], (rank[pid], arrival[pid], pid))
+        if stealing:
+            touch(core)
+
+    def dequeue(core):
+        pid = queues[core].popleft() if fifo else heapq.heappop(queues[core])[-1]
+        if stealing:
+            touch(core)
+        return pid
+
+    while completed < n:
+        time, c = heapq.heappop(events)
+        if c == waiter:
+            waiter = None
+        elif running[c] is None:
+            waking -= 1
+
+        # Arrivals up to now; a batch is queued in input order like the single-core engine
+        if cursor < n and arrival[order[cursor]] <= time:
+            start = cursor
+            while cursor < n and arrival[order[cursor]] <= time:
+                cursor += 1
+            for pid in sorted(order[start:cursor]):
+                if not stealing:
+                    enqueue(0, pid)
+                elif running[c] is None and not queues[c]:
+                    enqueue(c, pid)
+                elif waiter is not None and not queues[waiter]:
+                    # Its wake-up is due now; from here on it counts as an ordinary woken core
+                    enqueue(waiter, pid)
+                    waiter = None
+                    waking += 1
+                elif idle:
+                    core = heapq.heappop(idle)
+                    heapq.heappush(events, (time, core))
+                    waking += 1
+                    enqueue(core, pid)
+                else:
+                    enqueue(placement, pid)
+                    placement = (placement + 1) % cores
+            queued += cursor - start
+
+        # The core's last slice ended; a preempted Round Robin process goes behind the new arrivals
+        if running[c] is not None:
+            pid = running[c]
+            running[c] = None
+            if remaining[pid] == 0:
+                completion[pid] = time
+                completed += 1
+                if progress is not None and completed % PROGRESS_EVERY == 0:
+                    progress(completed, n)
+            else:
+                enqueue(c if stealing else 0, pid)
+                queued += 1
+
+        home = c if stealing else 0
+        pid = None
+        if queues[home]:
+            pid = dequeue(home)
+        elif stealing and queued:
+            victim = _victim(load, queues, running)
+            if victim is not None:
+                pid = dequeue(victim)
+                steals += 1
+
+        if pid is None:
+            heapq.heappush(idle, c)
+        else:
+            queued -= 1
+            exec_time = min(quantum, remaining[pid]) if fifo else remaining[pid]
+            remaining[pid] -= exec_time
+            end = time + exec_time
+            running[c] = pid
+            heapq.heappush(events, (end, c))
+
+            k = last_slice[c]
+            if k is not None and slices.pid[k] == pid and slices.end[k] == time:
+                slices.set_end(k, end)
+            else:
+                last_slice[c] = len(slices)
+                slices.append(pid, time, end)
+                slice_core.append(c)
+
+        # Wake parked cores for work nobody is about to pick up
+        while idle and queued > waking:
+            heapq.heappush(events, (time, heapq.heappop(idle)))
+            waking += 1
+
+        # Some parked core has to be awake when the next process arrives
+        if waiter is None and idle and cursor < n:
+            waiter = heapq.heappop(idle)
+            heapq.heappush(events, (arrival[order[cursor]], waiter))
+
+    return _result(algorithm, arrival, burst, completion, slices, slice_core, cores, steals,
+                   base_energy_unit, threshold, low_factor, high_factor)
+
+
+def _victim(load, queues, running):
+    # Most loaded queue that can spare a job, or None. Every non-empty queue has an
+    # entry for its current length; an idle owner keeps the job it is about to run.
+    skipped = []
+    victim = None
+    while load:
+        length, core = load[0]
+        if -length != len(queues[core]):
+            heapq.heappop(load)
+        elif -length > (running[core] is None):
+            victim = core
+            break
+        else:
+            skipped.append(heapq.heappop(load))
+    for entry in skipped:
+        heapq.heappush(load, entry)
+    return victim
+
+
+def _result(algorithm, arrival, burst, completion, slices, slice_core, cores, steals,
+            base_energy_unit, threshold, low_factor, high_factor):
+    busy = [0] * cores
+    energy = [0] * cores
+    for (pid, start, end), core in zip(slices, slice_core):
+        busy[core] += end - start
+        energy[core] += work_energy(end - start, burst[pid], base_energy_unit, threshold, low_factor, high_factor)
+
+    turnaround = [ct - at for ct, at in zip(completion, arrival)]
+    waiting = [tat - bt for tat, bt in zip(turnaround, burst)]
+    schedule = ScheduleResult(algorithm, column(arrival), column(burst), column(completion), column(turnaround), column(waiting),
+                              slices, sum(energy))
+
+    makespan = max(completion, default=0)
+    utilization = [b / makespan if makespan else 0.0 for b in busy]
+    return MultiCoreResult(schedule, cores, slice_core, busy, utilization, energy, steals)
@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import heapq
+import json
+import math
+import sys
+import time as clock
+from collections import deque, namedtuple
+
+import SchedulingEngine
+from Metrics import RunningStats
+
+# Online scheduling over a stream of arrivals.
+#
+# Jobs are fed one at a time in arrival order and completions come out as the
+# simulated CPU gets to them, so nothing proportional to the total job count is
+# kept: only jobs that have arrived and not yet finished, plus running
+# aggregates. Decisions match the batch SchedulingEngine policies exactly; the
+# only subtlety is that a decision at time t has to wait until every job
+# arriving at t has been fed, since any of them could win it.
+
+Job = namedtuple("Job", ["pid", "arrival", "burst", "priority"])
+Completion = namedtuple("Completion", ["pid", "arrival", "burst", "completion", "turnaround", "waiting"])
+
+
+class OnlineScheduler:
+    def __init__(self, algorithm, quantum=None, aging=0, stats=None):
+        if algorithm not in SchedulingEngine.ALGORITHMS:
+            raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+        if algorithm == "Round Robin" and (quantum is None or quantum <= 0):
+            raise ValueError("Time quantum must be positive.")
+        if aging < 0:
+            raise ValueError("Aging rate cannot be negative.")
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.aging = aging
+        self.stats = stats if stats is not None else RunningStats()
+
+        self.incoming = deque()  # fed jobs the simulation has not reached yet, in arrival order
+        self.ready = deque() if algorithm == "Round Robin" else []
+        self.remaining = {}  # pid -> work left, for jobs that have started
+        self.time = 0
+        self.current = None  # running job (preemptive policies)
+        self.current_priority = None
+        self.preempted = None  # Round Robin job waiting to rejoin the queue behind new arrivals
+        self.first_start = {}  # pid -> first dispatch, for jobs that may be preempted
+        self.last_pid = None
+        self.fed = 0
+        self.last_arrival = None
+
+    def __len__(self):
+        # Jobs held in memory: the ready set plus any not yet reached
+        return len(self.incoming) + len(self.ready) + (self.current is not None) + (self.preempted is not None)
+
+    def feed(self, arrival, burst, priority=0):
+        # Admit the next job of the stream; returns the completions that are now certain
+        if self.last_arrival is not None and arrival < self.last_arrival:
+            raise ValueError("Streamed jobs must be sorted by arrival time.")
+        self.last_arrival = arrival
+        done = self._advance(arrival)
+        self.incoming.append(Job(self.fed, arrival, burst, priority))
+        self.fed += 1
+        return done
+
+    def finish(self):
+        # End of stream: run everything that is left
+        return self._advance(math.inf)
+
+    def _advance(self, limit):
+        if self.algorithm == "Round Robin":
+            return self._advance_round_robin(limit)
+        if self.algorithm in ("SRTF", "Priority (Preemptive)"):
+            return self._advance_preemptive(limit)
+        return self._advance_run_to_completion(limit)
+
+    def _decision_time(self):
+        # When the idle CPU next has something to pick, or None if nothing is known yet
+        if self.ready or (self.incoming and self.incoming[0].arrival <= self.time):
+            return self.time
+        if self.incoming:
+            return self.incoming[0].arrival
+        return None
+
+    def _admit(self, key):
+        while self.incoming and self.incoming[0].arrival <= self.time:
+            job = self.incoming.popleft()
+            if key is None:
+                self.ready.append(job)
+            else:
+                heapq.heappush(self.ready, (key(job), job.arrival, job.pid, job))
+
+    def _dispatch(self, job):
+        if self.last_pid is not None and job.pid != self.last_pid:
+            self.stats.context_switches += 1
+        self.last_pid = job.pid
+        self.first_start.setdefault(job.pid, self.time)
+
+    def _complete(self, job, done):
+        turnaround = self.time - job.arrival
+        waiting = turnaround - job.burst
+        self.remaining.pop(job.pid, None)
+        self.stats.add(job.arrival, job.burst, self.time, self.first_start.pop(job.pid))
+        done.append(Completion(job.pid, job.arrival, job.burst, self.time, turnaround, waiting))
+
+    def _advance_run_to_completion(self, limit):
+        if self.algorithm == "FCFS":
+            key = lambda job: job.arrival
+        elif self.algorithm == "SJF":
+            key = lambda job: job.burst
+        else:
+            key = lambda job: job.priority
+
+        done = []
+        while True:
+            t = self._decision_time()
+            if t is None or t >= limit:
+                break
+            self.time = t
+            self._admit(key)
+            job = heapq.heappop(self.ready)[-1]
+            self._dispatch(job)
+            self.time += job.burst
+            self._complete(job, done)
+        return done
+
+    def _advance_round_robin(self, limit):
+        done = []
+        while True:
+            if self.preempted is None:
+                t = self._decision_time()
+                if t is None or t >= limit:
+                    break
+                self.time = t
+                self._admit(None)
+            else:
+                # The slice ended at self.time; arrivals up to then queue ahead of it
+                if self.time >= limit:
+                    break
+                self._admit(None)
+                self.ready.append(self.preempted)
+                self.preempted = None
+
+            job = self.ready.popleft()
+            self._dispatch(job)
+            left = self.remaining.get(job.pid, job.burst)
+            exec_time = min(self.quantum, left)
+            self.time += exec_time
+            if left == exec_time:
+                self._complete(job, done)
+            else:
+                self.remaining[job.pid] = left - exec_time
+                self.preempted = job
+        return done
+
+    def _advance_preemptive(self, limit):
+        aging = self.aging
+        if self.algorithm == "SRTF":
+            key = lambda job: job.burst
+        else:
+            key = lambda job: job.priority + aging * job.arrival
+
+        done = []
+        while True:
+            if self.current is None:
+                t = self._decision_time()
+                if t is None or t >= limit:
+                    break
+                self.time = t
+                self._admit(key)
+                k, _, _, self.current = heapq.heappop(self.ready)
+                self._dispatch(self.current)
+                self.current_priority = None if self.algorithm == "SRTF" else k - aging * self.time
+
+            job = self.current
+            left = self.remaining.get(job.pid, job.burst)
+            event = self.incoming[0].arrival if self.incoming else limit
+            if self.time + left <= event:
+                # Finishes before anything else arrives
+                self.time += left
+                self.current = None
+                self._complete(job, done)
+                continue
+
+            # Run up to the next arrival; at the stream's frontier, wait for the rest of it
+            self.remaining[job.pid] = left - (event - self.time)
+            self.time = event
+            if event >= limit:
+                break
+            self._admit(key)
+            if self.algorithm == "SRTF":
+                preempt = self.ready[0][0] < self.remaining[job.pid]
+            else:
+                preempt = self.ready[0][0] - aging * self.time < self.current_priority
+            if preempt:
+                k = self.remaining[job.pid] if self.algorithm == "SRTF" else self.current_priority + aging * self.time
+                heapq.heappush(self.ready, (k, job.arrival, job.pid, job))
+                self.current = None
+        return done
+
+
+def schedule(algorithm, jobs, quantum=None, aging=0, stats=None):
+    # Generator of completions over an iterable of (arrival, burst[, priority]) in arrival order
+    scheduler = OnlineScheduler(algorithm, quantum, aging, stats)
+    for job in jobs:
+        yield from scheduler.feed(*job)
+    yield from scheduler.finish()
+
+
+async def aschedule(algorithm, jobs, quantum=None, aging=0, stats=None):
+    # Same as schedule() over an async iterable, e.g. records read from a socket
+    scheduler = OnlineScheduler(algorithm, quantum, aging, stats)
+    async for job in jobs:
+        for completion in scheduler.feed(*job):
+            yield completion
+    for completion in scheduler.finish():
+        yield completion
+
+
+def parse(line):
+    # "arrival,burst[,priority]" -> tuple of numbers, None for blank or header lines
+    fields = [field.strip() for field in line.split(",")]
+    try:
+        values = [float(field) if "." in field else int(field) for field in fields[:3]]
+    except ValueError:
+        return None
+    return tuple(values) if len(values) >= 2 else None
+
+
+def follow(path, poll=0.2, idle_timeout=None):
+    # Jobs from a growing CSV file (like tail -f), or stdin for "-". Stops at end
+    # of input for stdin, otherwise after idle_timeout seconds without new lines
+    # (never, if None).
+    if path == "-":
+        for line in sys.stdin:
+            job = parse(line)
+            if job is not None:
+                yield job
+        return
+
+    with open(path) as f:
+        for job in _tail(f, idle_timeout):
+            if job is _WAIT:
+                clock.sleep(poll)
+            else:
+                yield job
+
+
+async def afollow(path, poll=0.2, idle_timeout=None):
+    # Async counterpart of follow() for files, polling without blocking the event loop
+    with open(path) as f:
+        for job in _tail(f, idle_timeout):
+            if job is _WAIT:
+                await asyncio.sleep(poll)
+            else:
+                yield job
+
+
+_WAIT = object()
+
+
+def _tail(f, idle_timeout):
+    # Jobs from complete lines of a growing file, with _WAIT whenever nothing new
+    # has been written yet; the caller sleeps (or awaits) before asking again.
+    # A trailing line without a newline is only taken at the idle timeout.
+    pending = ""
+    idle_since = clock.monotonic()
+    while True:
+        chunk = f.readline()
+        if chunk:
+            pending += chunk
+            if pending.endswith("\n"):
+                job = parse(pending)
+                pending = ""
+                idle_since = clock.monotonic()
+                if job is not None:
+                    yield job
+            continue
+        if idle_timeout is not None and clock.monotonic() - idle_since >= idle_timeout:
+            job = parse(pending)
+            if job is not None:
+                yield job
+            return
+        yield _WAIT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule a live job stream and report completions as they happen.")
+    parser.add_argument("source", help="CSV file to follow (arrival,burst[,priority] per line), or - for stdin")
+    parser.add_argument("--algorithm", default="FCFS", choices=SchedulingEngine.ALGORITHMS)
+    parser.add_argument("--quantum", type=int, default=2, help="Round Robin time quantum")
+    parser.add_argument("--aging", type=float, default=0, help="aging rate for Priority (Preemptive)")
+    parser.add_argument("--idle-timeout", type=float, help="stop after this many seconds without new jobs")
+    parser.add_argument("--every", type=int, default=1000, help="print a running summary every N completions")
+    parser.add_argument("--completions", action="store_true", help="print every completion")
+    args = parser.parse_args()
+
+    stats = RunningStats()
+    jobs = follow(args.source, idle_timeout=args.idle_timeout)
+    for count, completion in enumerate(schedule(args.algorithm, jobs, args.quantum, args.aging, stats), 1):
+        if args.completions:
+            print(",".join(str(value) for value in completion), flush=True)
+        if count % args.every == 0:
+            print(json.dumps(stats.summary()), file=sys.stderr, flush=True)
+    print(json.dumps(stats.summary()))
+
+
+if __name__ == "__main__":
+    main()
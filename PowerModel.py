@@ -0,0 +1,149 @@
+from bisect import bisect_right
+from collections import namedtuple
+from dataclasses import dataclass
+
+import numpy as np
+
+import VectorEngine
+from SchedulingEngine import PROGRESS_EVERY, ScheduleResult
+from VectorEngine import SliceColumns
+
+# DVFS power model: a table of P-states, each a (frequency, voltage, dynamic
+# power, static power) operating point. Bursts are measured in time units at the
+# fastest P-state and stretch by f_max / f at lower frequencies. Idle gaps cost
+# idle_power per time unit.
+#
+# All per-state quantities are precomputed into small lookup arrays, so choosing
+# and evaluating frequencies over a trace is a gather, not a Python loop.
+
+PState = namedtuple("PState", ["frequency", "voltage", "dynamic_power", "static_power"])
+
+
+class PowerModel:
+    def __init__(self, pstates, idle_power=0.0):
+        if not pstates:
+            raise ValueError("A power model needs at least one P-state.")
+        if any(p.frequency <= 0 for p in pstates):
+            raise ValueError("P-state frequencies must be positive.")
+
+        self.pstates = sorted(pstates, key=lambda p: -p.frequency)  # fastest first
+        self.idle_power = idle_power
+
+        f_max = self.pstates[0].frequency
+        self.scale = np.array([f_max / p.frequency for p in self.pstates])  # time stretch, ascending
+        self.power = np.array([p.dynamic_power + p.static_power for p in self.pstates])
+        self.energy_per_unit = self.power * self.scale  # energy per unit of work
+
+        # best_within[k]: cheapest state among the k + 1 fastest
+        best = np.zeros(len(self.pstates), dtype=np.intp)
+        for k in range(1, len(best)):
+            best[k] = k if self.energy_per_unit[k] < self.energy_per_unit[best[k - 1]] else best[k - 1]
+        self.best_within = best
+
+    def __len__(self):
+        return len(self.pstates)
+
+    @classmethod
+    def default(cls):
+        # Illustrative 4-state table, dynamic power ~ C V^2 f and leakage ~ V
+        capacitance = 2.5
+        points = [(3.0, 1.20), (2.4, 1.05), (1.8, 0.95), (1.2, 0.85)]
+        return cls([PState(f, v, capacitance * v * v * f, 4.0 * v) for f, v in points], idle_power=0.8)
+
+    def cheapest_within(self, stretch):
+        # Cheapest P-state whose time stretch is at most `stretch` (the fastest if none is)
+        k = np.searchsorted(self.scale, stretch, side="right") - 1
+        return self.best_within[np.maximum(k, 0)]
+
+
+@dataclass
+class DvfsSchedule:
+    schedule: ScheduleResult
+    states: np.ndarray  # P-state index per process
+    frequency: np.ndarray  # frequency per process
+    busy_energy: float
+    idle_energy: float
+
+    @property
+    def energy(self):
+        return self.busy_energy + self.idle_energy
+
+
+def run(table, model, states=0, progress=None):
+    # FCFS with each process running at its P-state (scalar or per-process indices)
+    states = np.broadcast_to(np.asarray(states, dtype=np.intp), (len(table),))
+    exec_time = table.burst * model.scale[states]
+
+    if table.is_sorted():
+        order = np.arange(len(table))
+        end = VectorEngine.fcfs_completion(table.arrival, exec_time, progress=progress)
+        completion = end
+    else:
+        order = np.argsort(table.arrival, kind="stable")
+        end = VectorEngine.fcfs_completion(table.arrival[order], exec_time[order], progress=progress)
+        completion = np.empty_like(end)
+        completion[order] = end
+
+    busy_time = exec_time.sum()
+    busy_energy = float((exec_time * model.power[states]).sum())
+    idle_energy = 0.0
+    if len(table):
+        span = end[-1] - table.arrival[order[0]]
+        idle_energy = float(max(span - busy_time, 0) * model.idle_power)
+
+    turnaround = completion - table.arrival
+    waiting = turnaround - exec_time
+    slices = SliceColumns(order, end - exec_time[order], end)
+    schedule = ScheduleResult("FCFS (DVFS)", table.arrival, table.burst, completion, turnaround, waiting, slices,
+                              busy_energy + idle_energy)
+    frequency = np.array([p.frequency for p in model.pstates])[states]
+    return DvfsSchedule(schedule, np.asarray(states), frequency, busy_energy, idle_energy)
+
+
+def states_for_slowdown(table, model, slowdown):
+    # Cheapest state per process whose execution stretch stays within `slowdown`
+    # (scalar or per-process) of the fastest P-state
+    return np.broadcast_to(model.cheapest_within(slowdown), (len(table),))
+
+
+def states_for_deadlines(table, model, deadline, progress=None):
+    # Greedy in FCFS order: each process spends its own slack before its absolute
+    # deadline on the cheapest state that still meets it, or runs flat out if none does
+    order = np.argsort(table.arrival, kind="stable")
+    arrival = table.arrival[order].tolist()
+    burst = table.burst[order].tolist()
+    deadline = np.broadcast_to(np.asarray(deadline), (len(table),))[order].tolist()
+    scale = model.scale.tolist()
+    best = model.best_within.tolist()
+
+    chosen = [0] * len(order)
+    time = 0
+    for j in range(len(order)):
+        if progress is not None and j % PROGRESS_EVERY == 0:
+            progress(j, len(order))
+        start = max(time, arrival[j])
+        state = 0
+        if burst[j] > 0:
+            k = bisect_right(scale, (deadline[j] - start) / burst[j]) - 1
+            if k >= 0:
+                state = best[k]
+        chosen[j] = state
+        time = start + burst[j] * scale[state]
+
+    states = np.empty(len(order), dtype=np.intp)
+    states[order] = chosen
+    return states
+
+
+def energy_aware(table, model, slowdown=None, deadline=None, progress=None):
+    # Pick per-process frequencies that minimise energy under a slowdown bound or
+    # per-process deadlines, then run the schedule with them
+    if (slowdown is None) == (deadline is None):
+        raise ValueError("Give exactly one of a slowdown bound or deadlines.")
+    if deadline is not None:
+        states = states_for_deadlines(table, model, deadline, progress)
+    else:
+        if np.any(np.asarray(slowdown) < 1):
+            raise ValueError("Slowdown bound must be at least 1.")
+        states = states_for_slowdown(table, model, slowdown)
+    return run(table, model, states, progress)
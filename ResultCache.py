@@ -0,0 +1,170 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+
+from MultiCore import MultiCoreResult
+from PowerModel import DvfsSchedule
+from SchedulingEngine import ScheduleResult
+from VectorEngine import SliceColumns
+
+# Content-addressed cache of scheduling results.
+#
+# A key is the SHA-256 of the workload columns plus every parameter that
+# affects the result, so an edited trace or a different quantum can never hit
+# a stale entry. Results live in an in-memory LRU bounded by an estimate of
+# their size, and optionally in a directory of .npz files (one per key) that
+# survives restarts and is shared between processes.
+
+_TYPES = {cls.__name__: cls for cls in (ScheduleResult, MultiCoreResult, DvfsSchedule)}
+
+
+def workload_key(table, algorithm, **params):
+    digest = hashlib.sha256()
+    for column in (table.arrival, table.burst, table.priority):
+        column = np.ascontiguousarray(column)
+        digest.update(f"{column.dtype.str}:{len(column)};".encode())
+        digest.update(column.data)
+    digest.update(repr((algorithm, sorted(params.items()))).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()  # key -> (result, estimated bytes), least recently used first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # the GUIs look results up from their worker thread
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        result = self._load(key)
+        with self.lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        # Stored columnar: Python lists of boxed numbers and Slice tuples would
+        # take several times the memory of the same values as arrays
+        arrays = _encode(result)
+        with self.lock:
+            self._remember(key, _decode(arrays))
+        if self.directory is not None:
+            self._store(key, arrays)
+
+    def get_or_run(self, table, algorithm, fn, **params):
+        # fn() computes the result on a miss
+        key = workload_key(table, algorithm, **params)
+        result = self.get(key)
+        if result is None:
+            result = fn()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _remember(self, key, result):
+        size = _size(result)
+        if size > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+        self.entries[key] = (result, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _store(self, key, arrays):
+        # Written under a temporary name and renamed, so readers never see a partial file
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as arrays:
+                return _decode(dict(arrays))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _encode(result, prefix=""):
+    # Flatten a result dataclass into named arrays for np.savez
+    arrays = {prefix + "type": np.array(type(result).__name__)}
+    for f in fields(result):
+        value = getattr(result, f.name)
+        name = prefix + f.name
+        if is_dataclass(value):
+            arrays.update(_encode(value, name + "."))
+        elif f.name == "slices":
+            value = SliceColumns.from_slices(value)
+            arrays[name + ".pid"] = np.asarray(value.pid)
+            arrays[name + ".start"] = np.asarray(value.start)
+            arrays[name + ".end"] = np.asarray(value.end)
+        else:
+            arrays[name] = np.asarray(value)
+    return arrays
+
+
+def _decode(arrays, prefix=""):
+    cls = _TYPES[str(arrays[prefix + "type"])]
+    values = {}
+    for f in fields(cls):
+        name = prefix + f.name
+        if name + ".type" in arrays:
+            values[f.name] = _decode(arrays, name + ".")
+        elif f.name == "slices":
+            values[f.name] = SliceColumns(arrays[name + ".pid"], arrays[name + ".start"], arrays[name + ".end"])
+        else:
+            value = arrays[name]
+            values[f.name] = value.item() if value.ndim == 0 else value
+    return cls(**values)
+
+
+def _size(value):
+    # Footprint of a columnar result: exact for the arrays, nominal for scalars
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, SliceColumns):
+        return value.pid.nbytes + value.start.nbytes + value.end.nbytes
+    if is_dataclass(value):
+        return sum(_size(getattr(value, f.name)) for f in fields(value))
+    return sys.getsizeof(value)
@@ -0,0 +1,123 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+# Paged results table over columnar result arrays.
+#
+# The Treeview only ever holds one screenful of rows; scrolling rewrites their
+# values from the arrays. Sorting and filtering build an index array over the
+# columns with NumPy, so a million-process result never becomes a million
+# widget items.
+
+OPERATORS = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal, "==": np.equal, "!=": np.not_equal}
+
+
+class ResultsView(tk.Frame):
+    def __init__(self, master, columns, formats=None, height=10, width=100, **kwargs):
+        # columns: mapping of heading -> sequence of values, one entry per process
+        super().__init__(master, **kwargs)
+        self.names = list(columns)
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+        self.formats = {name: "{:.2f}" if column.dtype.kind == "f" else "{}" for name, column in self.columns.items()}
+        self.formats.update(formats or {})
+        self.count = len(self.columns[self.names[0]]) if self.names else 0
+        self.height = height
+        self.view = np.arange(self.count)  # row order after filter and sort
+        self.offset = 0
+        self.sort_column = None
+        self.descending = False
+
+        self.tree = ttk.Treeview(self, columns=self.names, show="headings", height=height)
+        for name in self.names:
+            self.tree.heading(name, text=name, command=lambda name=name: self.sort(name))
+            self.tree.column(name, width=width, anchor="center")
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(height)]
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.tree.grid(row=0, column=0, columnspan=6, sticky="nsew")
+        self.scrollbar.grid(row=0, column=6, sticky="ns")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_wheel)
+
+        # Filter bar: <column> <operator> <value>
+        self.filter_column = tk.StringVar(value=self.names[-1] if self.names else "")
+        self.filter_operator = tk.StringVar(value=">")
+        tk.OptionMenu(self, self.filter_column, *self.names).grid(row=1, column=0, sticky="ew")
+        tk.OptionMenu(self, self.filter_operator, *OPERATORS).grid(row=1, column=1)
+        self.filter_entry = tk.Entry(self, width=10)
+        self.filter_entry.grid(row=1, column=2)
+        tk.Button(self, text="Filter", command=self.apply_filter).grid(row=1, column=3)
+        tk.Button(self, text="Clear", command=self.clear_filter).grid(row=1, column=4)
+        self.status = tk.Label(self)
+        self.status.grid(row=1, column=5, sticky="w")
+
+        self.refresh()
+
+    def refresh(self):
+        # Rewrite the visible items from the arrays for the current offset
+        self.offset = max(0, min(self.offset, len(self.view) - self.height))
+        rows = self.view[self.offset:self.offset + self.height]
+        values = [self.columns[name][rows].tolist() for name in self.names]
+        for k, item in enumerate(self.items):
+            if k < len(rows):
+                self.tree.item(item, values=[self.formats[name].format(column[k]) for name, column in zip(self.names, values)])
+            else:
+                self.tree.item(item, values=())
+
+        if len(self.view):
+            self.scrollbar.set(self.offset / len(self.view), (self.offset + len(rows)) / len(self.view))
+        else:
+            self.scrollbar.set(0, 1)
+        self.status.config(text=f"{len(self.view)} of {self.count} processes")
+
+    def yview(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.view))
+        elif unit == "pages":
+            self.offset += int(amount) * self.height
+        else:
+            self.offset += int(amount)
+        self.refresh()
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    def sort(self, name):
+        # Clicking the same heading again flips the direction
+        self.descending = not self.descending if self.sort_column == name else False
+        self.sort_column = name
+        self._order()
+        self.offset = 0
+        self.refresh()
+
+    def _order(self):
+        if self.sort_column is None:
+            return
+        order = np.argsort(self.columns[self.sort_column][self.view], kind="stable")
+        if self.descending:
+            order = order[::-1]
+        self.view = self.view[order]
+
+    def apply_filter(self):
+        try:
+            value = float(self.filter_entry.get())
+        except ValueError:
+            self.status.config(text="Filter value must be a number")
+            return
+        column = self.columns[self.filter_column.get()]
+        self.view = np.flatnonzero(OPERATORS[self.filter_operator.get()](column, value))
+        self._order()
+        self.offset = 0
+        self.refresh()
+
+    def clear_filter(self):
+        self.filter_entry.delete(0, tk.END)
+        self.view = np.arange(self.count)
+        self._order()
+        self.offset = 0
+        self.refresh()
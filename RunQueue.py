@@ -0,0 +1,114 @@
+import queue
+import threading
+from collections import deque
+
+# Runs simulations on a background thread so the Tk window stays responsive.
+#
+# Jobs run one at a time in submission order. A job is a function taking a
+# progress(done, total) callback; the scheduling engines call it every few
+# thousand completions. Cancelling makes the next progress call raise Cancelled,
+# which unwinds the engine. Tk is only ever touched from the main thread:
+# the worker posts messages to a queue that a root.after poll drains.
+
+
+class Cancelled(Exception):
+    pass
+
+
+class _Job:
+    def __init__(self, label, fn, on_done, on_error):
+        self.label = label
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = threading.Event()
+        self.fraction = 0.0
+
+
+class RunQueue:
+    def __init__(self, root, on_status=None, poll_ms=50):
+        self.root = root
+        self.on_status = on_status  # called on the Tk thread with a one-line status
+        self.poll_ms = poll_ms
+        self.pending = deque()
+        self.current = None
+        self.outbox = queue.Queue()
+        self.polling = False
+
+    def submit(self, label, fn, on_done, on_error=None):
+        # fn(progress) runs on the worker thread; on_done(result) / on_error(exception) on the Tk thread
+        self.pending.append(_Job(label, fn, on_done, on_error))
+        if self.current is None:
+            self._start_next()
+        self._report()
+
+    def cancel(self):
+        # Stop the running job; queued jobs still run
+        if self.current is not None:
+            self.current.cancelled.set()
+            self._report()
+
+    def cancel_all(self):
+        self.pending.clear()
+        self.cancel()
+
+    def _start_next(self):
+        self.current = self.pending.popleft() if self.pending else None
+        if self.current is None:
+            return
+        threading.Thread(target=self._work, args=(self.current,), daemon=True).start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _work(self, job):
+        def progress(done, total):
+            if job.cancelled.is_set():
+                raise Cancelled()
+            self.outbox.put(("progress", job, done / total if total else 1.0))
+
+        try:
+            self.outbox.put(("done", job, job.fn(progress)))
+        except Cancelled:
+            self.outbox.put(("cancelled", job, None))
+        except Exception as e:
+            self.outbox.put(("error", job, e))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, job, value = self.outbox.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                job.fraction = value
+                continue
+
+            # The job is over: start the next one before handing results to the GUI,
+            # which may block in a dialog
+            self._start_next()
+            if kind == "done" and not job.cancelled.is_set():
+                job.on_done(value)
+            elif kind == "error" and job.on_error is not None:
+                job.on_error(value)
+
+        self._report()
+        if self.current is not None:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self.polling = False
+
+    def _report(self):
+        if self.on_status is None:
+            return
+        job = self.current
+        if job is None:
+            status = "Idle"
+        elif job.cancelled.is_set():
+            status = f"Cancelling {job.label}..."
+        else:
+            status = f"Running {job.label}: {job.fraction:.0%}"
+        if self.pending:
+            status += f" ({len(self.pending)} queued)"
+        self.on_status(status)
@@ -0,0 +1,412 @@
+import heapq
+import operator
+from array import array
+from collections import deque, namedtuple
+from dataclasses import dataclass, field
+
+# Headless scheduling core shared by Simulator.py and EnergyEfficientScheduling.py.
+# Keep this module free of tkinter/matplotlib so batch jobs import it cheaply.
+
+ALGORITHMS = ("FCFS", "SJF", "Priority", "Round Robin", "SRTF", "Priority (Preemptive)")
+
+Slice = namedtuple("Slice", ["pid", "start", "end"])
+
+# Policies report progress(completed, total) this often when given a callback;
+# the callback may raise to abandon the run
+PROGRESS_EVERY = 1 << 14
+
+# Policies also take probe=None, an Instrumentation.Probe that counts events and
+# times each phase; see Instrumentation.py
+
+
+class SliceLog:
+    # Executed slices as three typed arrays: 24 bytes a slice instead of a Slice
+    # tuple and three boxed numbers. Iterates and indexes as Slice tuples. Times
+    # are int64 until the first fractional one, then float64.
+    __slots__ = ("pid", "start", "end")
+
+    def __init__(self):
+        self.pid = array("q")
+        self.start = array("q")
+        self.end = array("q")
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __iter__(self):
+        return map(Slice._make, zip(self.pid, self.start, self.end))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [Slice._make(s) for s in zip(self.pid[i], self.start[i], self.end[i])]
+        return Slice(self.pid[i], self.start[i], self.end[i])
+
+    def append(self, pid, start, end):
+        try:
+            self.start.append(start)
+            self.end.append(end)
+        except TypeError:
+            self._widen()
+            del self.start[len(self.pid):]  # start may have gone in before end failed
+            self.start.append(start)
+            self.end.append(end)
+        self.pid.append(pid)
+
+    def set_end(self, i, end):
+        # Extend slice i, e.g. when the same process keeps the CPU
+        try:
+            self.end[i] = end
+        except TypeError:
+            self._widen()
+            self.end[i] = end
+
+    def _widen(self):
+        if self.start.typecode != "d":
+            self.start = array("d", self.start)
+            self.end = array("d", self.end)
+
+
+@dataclass
+class ScheduleResult:
+    algorithm: str
+    arrival: list  # per-process columns: typed arrays, or NumPy arrays for columnar runs
+    burst: list
+    completion: list
+    turnaround: list
+    waiting: list
+    slices: list = field(default_factory=SliceLog)  # executed Slice(pid, start, end) in time order
+    energy: float = 0.0
+
+    def __len__(self):
+        return len(self.completion)
+
+    @property
+    def avg_waiting(self):
+        return _mean(self.waiting)
+
+    @property
+    def avg_turnaround(self):
+        return _mean(self.turnaround)
+
+    def metrics(self):
+        # Percentiles, slowdown, response time, utilization, context switches and
+        # fairness; imported lazily since Metrics needs NumPy
+        import Metrics
+        return Metrics.summarize(self)
+
+
+def _mean(values):
+    # Columnar (NumPy) results average themselves without boxing every element
+    mean = getattr(values, "mean", None)
+    if mean is not None:
+        return float(mean())
+    return sum(values) / len(values)
+
+
+def run(algorithm, arrival, burst, priorities=None, quantum=None, aging=0, progress=None, probe=None):
+    # Dispatch by the algorithm names used in the GUIs
+    if priorities is None:
+        priorities = [0] * len(arrival)
+    if algorithm == "FCFS":
+        return fcfs(arrival, burst, probe)
+    if algorithm == "SJF":
+        return sjf(arrival, burst, progress, probe)
+    if algorithm == "Priority":
+        return priority(arrival, burst, priorities, progress, probe)
+    if algorithm == "Round Robin":
+        if quantum is None or quantum <= 0:
+            raise ValueError("Time quantum must be positive.")
+        return round_robin(arrival, burst, quantum, progress, probe)
+    if algorithm == "SRTF":
+        return srtf(arrival, burst, progress, probe)
+    if algorithm == "Priority (Preemptive)":
+        if aging < 0:
+            raise ValueError("Aging rate cannot be negative.")
+        return preemptive_priority(arrival, burst, priorities, aging, progress, probe)
+    raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+
+
+def energy(burst, base_energy_unit=1.5, threshold=5, low_factor=0.8, high_factor=1.2):
+    total = 0
+    for bt in burst:
+        total += work_energy(bt, bt, base_energy_unit, threshold, low_factor, high_factor)
+    return total
+
+
+def work_energy(work, bt, base_energy_unit=1.5, threshold=5, low_factor=0.8, high_factor=1.2):
+    # DVFS-based energy scaling: energy of `work` time units of a process with
+    # burst bt; long bursts run at the cheaper operating point
+    return work * base_energy_unit * (low_factor if bt > threshold else high_factor)
+
+
+def fcfs(arrival, burst, probe=None):
+    # First Come First Serve, ties broken by input order
+    if probe is not None:
+        probe.start()
+    n = len(arrival)
+    order = sorted(range(n), key=arrival.__getitem__)
+    if probe is not None:
+        probe.lap("order")
+    columns, kind = _columns(arrival, burst)
+    completion = array(kind, bytes(8 * n))
+    slices = SliceLog()
+    time = 0
+
+    for i in order:
+        if probe is not None:
+            probe.queue_pushes += 1
+            probe.dispatch(1)
+            if arrival[i] > time:
+                probe.idle(arrival[i] - time)
+        start = max(time, arrival[i])
+        time = start + burst[i]
+        completion[i] = time
+        slices.append(i, start, time)
+
+    return _result("FCFS", columns, completion, slices, probe)
+
+
+def sjf(arrival, burst, progress=None, probe=None):
+    # Non-preemptive Shortest Job First, ties broken by arrival then input order
+    return _run_to_completion("SJF", arrival, burst, burst, progress, probe)
+
+
+def priority(arrival, burst, priority, progress=None, probe=None):
+    # Non-preemptive Priority (lower number = higher priority)
+    return _run_to_completion("Priority", arrival, burst, priority, progress, probe)
+
+
+def _run_to_completion(algorithm, arrival, burst, rank, progress=None, probe=None):
+    if probe is not None:
+        probe.start()
+    n = len(arrival)
+    order = sorted(range(n), key=arrival.__getitem__)
+    if probe is not None:
+        probe.lap("order")
+    columns, kind = _columns(arrival, burst)
+    completion = array(kind, bytes(8 * n))
+    slices = SliceLog()
+    ready = []
+    time = 0
+    cursor = 0
+
+    for done in range(n):
+        if progress is not None and done % PROGRESS_EVERY == 0:
+            progress(done, n)
+
+        # CPU is idle, jump straight to the next arrival instead of ticking
+        if not ready and arrival[order[cursor]] > time:
+            if probe is not None:
+                probe.idle(arrival[order[cursor]] - time)
+            time = arrival[order[cursor]]
+
+        # Admit everything that has arrived by now
+        while cursor < n and arrival[order[cursor]] <= time:
+            i = order[cursor]
+            heapq.heappush(ready, (rank[i], arrival[i], i))
+            cursor += 1
+
+        if probe is not None:
+            probe.dispatch(len(ready))
+        _, _, i = heapq.heappop(ready)
+        slices.append(i, time, time + burst[i])
+        time += burst[i]
+        completion[i] = time
+
+    if probe is not None:
+        probe.queue_pushes += n
+    return _result(algorithm, columns, completion, slices, probe)
+
+
+def round_robin(arrival, burst, quantum, progress=None, probe=None):
+    if probe is not None:
+        probe.start()
+    n = len(arrival)
+    order = sorted(range(n), key=arrival.__getitem__)
+    if probe is not None:
+        probe.lap("order")
+    columns, kind = _columns(arrival, burst, quantum)
+    remaining = array(kind, columns[1])
+    completion = array(kind, bytes(8 * n))
+    slices = SliceLog()
+    ready = deque()
+    time = 0
+    cursor = 0
+    completed = 0
+
+    while completed < n:
+        if not ready:
+            # CPU is idle, jump straight to the next arrival instead of ticking
+            if arrival[order[cursor]] > time:
+                if probe is not None:
+                    probe.idle(arrival[order[cursor]] - time)
+                time = arrival[order[cursor]]
+            cursor = _admit(arrival, order, cursor, time, ready)
+
+        if probe is not None:
+            probe.dispatch(len(ready))
+        i = ready.popleft()
+        exec_time = min(quantum, remaining[i])
+        if slices.pid and slices.pid[-1] == i:
+            # Same process keeps the CPU, extend its slice
+            slices.set_end(-1, time + exec_time)
+        else:
+            slices.append(i, time, time + exec_time)
+        time += exec_time
+        remaining[i] -= exec_time
+
+        # Processes that arrived during this slice queue ahead of the current one
+        if cursor < n and arrival[order[cursor]] <= time:
+            cursor = _admit(arrival, order, cursor, time, ready)
+
+        if remaining[i] == 0:
+            completion[i] = time
+            completed += 1
+            if progress is not None and completed % PROGRESS_EVERY == 0:
+                progress(completed, n)
+        else:
+            ready.append(i)
+            if probe is not None:
+                probe.queue_pushes += 1
+                probe.preemptions += 1
+
+    if probe is not None:
+        probe.queue_pushes += n  # admissions
+    return _result("Round Robin", columns, completion, slices, probe)
+
+
+def srtf(arrival, burst, progress=None, probe=None):
+    # Shortest Remaining Time First: an arrival with strictly less work left
+    # than the running process preempts it
+    return _preemptive("SRTF", arrival, burst, None, 0, progress, probe)
+
+
+def preemptive_priority(arrival, burst, priority, aging=0, progress=None, probe=None):
+    # Preemptive Priority (lower number = higher priority). With aging, a waiting
+    # process's priority number drops by `aging` per time unit spent in the ready
+    # queue; like preemption itself, this is re-evaluated at arrivals and completions.
+    return _preemptive("Priority (Preemptive)", arrival, burst, priority, aging, progress, probe)
+
+
+def _preemptive(algorithm, arrival, burst, priority, aging, progress=None, probe=None):
+    # Discrete-event loop: the running process keeps the CPU until it completes or
+    # the next arrival, so the ready heap is only touched at those events.
+    #
+    # Ready entries are (key, arrival, pid). For SRTF the key is the remaining
+    # time. For priority it is priority + aging * enqueue_time, which orders the
+    # waiting processes by effective priority (key - aging * now) at any instant.
+    if probe is not None:
+        probe.start()
+    n = len(arrival)
+    order = sorted(range(n), key=arrival.__getitem__)
+    if probe is not None:
+        probe.lap("order")
+    by_remaining = priority is None
+    columns, kind = _columns(arrival, burst)
+    remaining = array(kind, columns[1])
+    completion = array(kind, bytes(8 * n))
+    slices = SliceLog()
+    ready = []
+    time = 0
+    cursor = 0
+    completed = 0
+    current = None
+
+    while completed < n:
+        if current is None:
+            # CPU is idle, jump straight to the next arrival instead of ticking
+            if not ready and arrival[order[cursor]] > time:
+                if probe is not None:
+                    probe.idle(arrival[order[cursor]] - time)
+                time = arrival[order[cursor]]
+            while cursor < n and arrival[order[cursor]] <= time:
+                i = order[cursor]
+                heapq.heappush(ready, (remaining[i] if by_remaining else priority[i] + aging * arrival[i], arrival[i], i))
+                cursor += 1
+
+            if probe is not None:
+                probe.dispatch(len(ready))
+            key, _, current = heapq.heappop(ready)
+            current_priority = None if by_remaining else key - aging * time
+            started = time
+
+        next_arrival = arrival[order[cursor]] if cursor < n else None
+        if next_arrival is None or time + remaining[current] <= next_arrival:
+            # Runs to completion before anything else arrives
+            time += remaining[current]
+            remaining[current] = 0
+            completion[current] = time
+            slices.append(current, started, time)
+            completed += 1
+            current = None
+            if progress is not None and completed % PROGRESS_EVERY == 0:
+                progress(completed, n)
+            continue
+
+        # Arrival event: account for the work done so far, admit, re-evaluate
+        remaining[current] -= next_arrival - time
+        time = next_arrival
+        while cursor < n and arrival[order[cursor]] <= time:
+            i = order[cursor]
+            heapq.heappush(ready, (remaining[i] if by_remaining else priority[i] + aging * arrival[i], arrival[i], i))
+            cursor += 1
+
+        if by_remaining:
+            preempt = ready[0][0] < remaining[current]
+        else:
+            preempt = ready[0][0] - aging * time < current_priority
+        if preempt:
+            slices.append(current, started, time)
+            key = remaining[current] if by_remaining else current_priority + aging * time
+            heapq.heappush(ready, (key, arrival[current], current))
+            current = None
+            if probe is not None:
+                probe.queue_pushes += 1
+                probe.preemptions += 1
+
+    if probe is not None:
+        probe.queue_pushes += n  # admissions
+    return _result(algorithm, columns, completion, slices, probe)
+
+
+def column(values):
+    # Typed array of per-process numbers: int64 if all are integers, else float64
+    try:
+        return array("q", values)
+    except TypeError:
+        return array("d", values)
+
+
+def _columns(arrival, burst, *times):
+    # Typed arrival and burst columns, plus the typecode for the times a policy
+    # computes from them: float64 once any input time is fractional
+    columns = (column(arrival), column(burst))
+    fractional = "d" in (columns[0].typecode, columns[1].typecode) or any(isinstance(t, float) for t in times)
+    return columns, "d" if fractional else "q"
+
+
+def _admit(arrival, order, cursor, time, ready):
+    # Each process passes the cursor exactly once, so no membership checks are
+    # needed; a batch is queued in input order like the original simulator did
+    start = cursor
+    n = len(order)
+    while cursor < n and arrival[order[cursor]] <= time:
+        cursor += 1
+    if cursor - start == 1:
+        ready.append(order[start])
+    elif cursor > start:
+        ready.extend(sorted(order[start:cursor]))
+    return cursor
+
+
+def _result(algorithm, columns, completion, slices, probe=None):
+    # Differences are streamed straight into typed arrays, never into lists
+    if probe is not None:
+        probe.lap("schedule")
+    arrival, burst = columns
+    turnaround = array(completion.typecode, map(operator.sub, completion, arrival))
+    waiting = array(completion.typecode, map(operator.sub, turnaround, burst))
+    result = ScheduleResult(algorithm, arrival, burst, completion, turnaround, waiting, slices, energy(burst))
+    if probe is not None:
+        probe.lap("result")
+    return result
@@ -1,8 +1,16 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
-import matplotlib.pyplot as plt
-import numpy as np
-from collections import deque
+from tkinter import filedialog, messagebox
+
+import Incremental
+import MultiCore
+import SchedulingEngine
+import Timeline
+import TraceLoader
+import VectorEngine
+from ResultCache import ResultCache
+from ResultsView import ResultsView
+from RunQueue import RunQueue
+from VectorEngine import ProcessTable
 
 class CPUScheduler:
     def __init__(self, root):
@@ -16,6 +24,13 @@ class CPUScheduler:
         self.process_count_entry = tk.Entry(root, width=10)
         self.process_count_entry.pack()
         tk.Button(root, text="Set Processes", command=self.create_process_entries, bg="#3498db", fg="white").pack(pady=5)
+        tk.Button(root, text="Load Trace...", command=self.load_trace, bg="#3498db", fg="white").pack(pady=5)
+
+        self.trace = None
+        self.figure = None
+        self.arrival_entries = []
+        self.burst_entries = []
+        self.priority_entries = []
 
         self.process_frame = tk.Frame(root, bg="#2c3e50")
         self.process_frame.pack()
@@ -24,14 +39,31 @@ class CPUScheduler:
         self.algorithm = tk.StringVar()
         self.algorithm.set("FCFS")
 
-        algorithms = ["FCFS", "SJF", "Priority", "Round Robin"]
-        for algo in algorithms:
+        for algo in SchedulingEngine.ALGORITHMS:
             tk.Radiobutton(root, text=algo, variable=self.algorithm, value=algo, bg="#2c3e50", fg="white", command=self.toggle_fields).pack()
 
         self.quantum_label = tk.Label(root, text="Enter Time Quantum (Only for Round Robin):", fg="white", bg="#2c3e50")
         self.quantum_entry = tk.Entry(root, width=10)
-
+        self.aging_label = tk.Label(root, text="Enter Aging Rate (Only for Preemptive Priority, 0 = off):", fg="white", bg="#2c3e50")
+        self.aging_entry = tk.Entry(root, width=10)
+        self.aging_entry.insert(0, "0")
+
+        tk.Label(root, text="Number of Cores:", fg="white", bg="#2c3e50").pack()
+        self.cores_entry = tk.Entry(root, width=10)
+        self.cores_entry.insert(0, "1")
+        self.cores_entry.pack()
+        self.balancing = tk.StringVar()
+        self.balancing.set("global")
+        tk.OptionMenu(root, self.balancing, *MultiCore.BALANCING).pack()
+
+        # Each click queues a run on the background worker; Cancel stops the one in progress
         tk.Button(root, text="Run Simulation", command=self.run_simulation, bg="#27ae60", fg="white", font=("Arial", 12)).pack(pady=5)
+        tk.Button(root, text="Cancel", command=self.cancel_simulation, bg="#c0392b", fg="white").pack()
+        self.status_label = tk.Label(root, text="Idle", fg="white", bg="#2c3e50")
+        self.status_label.pack()
+        self.runs = RunQueue(root, on_status=lambda status: self.status_label.config(text=status))
+        self.cache = ResultCache()  # repeat runs of the same workload and settings are lookups
+        self.incremental = {}  # (algorithm, quantum) -> IncrementalSchedule of the entry grid
 
         self.result_frame = tk.Frame(root, bg="#2c3e50")
         self.result_frame.pack()
@@ -39,6 +71,7 @@ class CPUScheduler:
     def create_process_entries(self):
         for widget in self.process_frame.winfo_children():
             widget.destroy()
+        self.trace = None
 
         try:
             self.num_processes = int(self.process_count_entry.get())
@@ -49,16 +82,13 @@ class CPUScheduler:
             for i, header in enumerate(headers):
                 tk.Label(self.process_frame, text=header, fg="white", bg="#2c3e50").grid(row=0, column=i, padx=10)
 
-            self.process_names = []
             self.arrival_entries = []
             self.burst_entries = []
             self.priority_entries = []
 
+            # Processes are identified by index; "P<n>" is only ever a display format
             for i in range(self.num_processes):
-                process_name = f"P{i+1}"
-                self.process_names.append(process_name)
-
-                tk.Label(self.process_frame, text=process_name, fg="white", bg="#2c3e50").grid(row=i+1, column=0)
+                tk.Label(self.process_frame, text=f"P{i+1}", fg="white", bg="#2c3e50").grid(row=i+1, column=0)
                 at_entry = tk.Entry(self.process_frame, width=10)
                 bt_entry = tk.Entry(self.process_frame, width=10)
                 pr_entry = tk.Entry(self.process_frame, width=10)
@@ -76,7 +106,7 @@ class CPUScheduler:
             messagebox.showerror("Error", str(e))
 
     def toggle_fields(self):
-        if self.algorithm.get() == "Priority":
+        if self.algorithm.get() in ("Priority", "Priority (Preemptive)"):
             for entry in self.priority_entries:
                 entry.config(state="normal")
         else:
@@ -90,255 +120,172 @@ class CPUScheduler:
             self.quantum_label.pack_forget()
             self.quantum_entry.pack_forget()
 
-    def run_simulation(self):
-        try:
-            burst_times = [int(bt.get()) for bt in self.burst_entries]
-            arrival_times = [int(at.get()) for at in self.arrival_entries]
-            priorities = [int(pr.get()) if self.algorithm.get() == "Priority" else 0 for pr in self.priority_entries]
+        if self.algorithm.get() == "Priority (Preemptive)":
+            self.aging_label.pack()
+            self.aging_entry.pack()
+        else:
+            self.aging_label.pack_forget()
+            self.aging_entry.pack_forget()
 
-            process_data = list(zip(self.process_names, arrival_times, burst_times, priorities))
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Load Job Trace", filetypes=[("Job traces", "*.csv *.bin"), ("All files", "*")])
+        if not path:
+            return
 
-            if self.algorithm.get() == "Round Robin":
-                quantum = int(self.quantum_entry.get())
-                if quantum <= 0:
-                    raise ValueError("Time quantum must be positive.")
-
-            if self.algorithm.get() == "FCFS":
-                self.fcfs(process_data)
-            elif self.algorithm.get() == "SJF":
-                self.sjf(process_data)
-            elif self.algorithm.get() == "Priority":
-                self.priority_scheduling(process_data)
-            elif self.algorithm.get() == "Round Robin":
-                self.round_robin(process_data, quantum)
+        self.runs.submit("trace loading", lambda progress: self.read_trace(path), self.set_trace, self.show_error)
 
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
+    def read_trace(self, path):
+        # Runs on the worker thread
+        trace = TraceLoader.load(path)
+        if len(trace) == 0:
+            raise ValueError("Trace contains no jobs.")
+        return trace
 
-    def fcfs(self, process_data):
-        sorted_processes = sorted(process_data, key=lambda x: x[1])
-        self.calculate_and_display(sorted_processes)
-
-    def sjf(self, process_data):
-        process_data.sort(key=lambda x: (x[1], x[2]))  # Sort by arrival time and burst time
-        n = len(process_data)
-        remaining_time = [p[2] for p in process_data]
-        completion_time = [0] * n
-        waiting_time = [0] * n
-        turnaround_time = [0] * n
-        ready_queue = []
-        time = 0
-        completed = 0
-
-        while completed < n:
-            # Add processes to ready queue based on their arrival time
-            for i in range(n):
-                if process_data[i][1] <= time and remaining_time[i] > 0 and i not in ready_queue:
-                    ready_queue.append(i)
-
-            if not ready_queue:
-                time += 1
-                continue
-
-            # Sort the ready queue by remaining time (SJF)
-            ready_queue.sort(key=lambda i: remaining_time[i])
-            index = ready_queue.pop(0)
-
-            # Execute the selected process
-            time += remaining_time[index]
-            remaining_time[index] = 0
-            completion_time[index] = time
-            turnaround_time[index] = completion_time[index] - process_data[index][1]
-            waiting_time[index] = turnaround_time[index] - process_data[index][2]
-            completed += 1
-
-        # Calculate averages
-        avg_wt = sum(waiting_time) / n
-        avg_tat = sum(turnaround_time) / n
-        
-        # Sorting processes back by their original order
-        sorted_by_process = sorted(zip(process_data, completion_time, turnaround_time, waiting_time), key=lambda x: int(x[0][0][1:]))
-        sorted_processes, completion_time, turnaround_time, waiting_time = zip(*sorted_by_process)
-        
-        self.display_table(sorted_processes, completion_time, waiting_time, turnaround_time)
-        self.plot_gantt_chart([ct - bt for ct, bt in zip(completion_time, [p[2] for p in sorted_processes])], 
-                            completion_time, n, sorted_processes)
-        
-        messagebox.showinfo("Results", f"Avg Waiting Time: {avg_wt:.2f}\nAvg Turnaround Time: {avg_tat:.2f}")
-
-    def priority_scheduling(self, process_data):
-        # Sort by priority (lower number = higher priority), then by arrival time
-        process_data.sort(key=lambda x: (x[3], x[1]))
-        
-        n = len(process_data)
-        remaining_time = [p[2] for p in process_data]
-        arrival_time = [p[1] for p in process_data]
-        completion_time = [0] * n
-        waiting_time = [0] * n
-        turnaround_time = [0] * n
-        time = 0
-        
-        while True:
-            # Find the highest priority process that has arrived and has remaining time
-            selected = None
-            for i in range(n):
-                if arrival_time[i] <= time and remaining_time[i] > 0:
-                    if selected is None or process_data[i][3] < process_data[selected][3]:
-                        selected = i
-            
-            if selected is None:
-                # No process available, advance time
-                time += 1
-                continue
-            
-            # Execute the selected process to completion (non-preemptive)
-            time += remaining_time[selected]
-            completion_time[selected] = time
-            remaining_time[selected] = 0
-            turnaround_time[selected] = completion_time[selected] - arrival_time[selected]
-            waiting_time[selected] = turnaround_time[selected] - process_data[selected][2]
-            
-            # Check if all processes are completed
-            if all(rt == 0 for rt in remaining_time):
-                break
-        
-        # Calculate averages
-        avg_wt = sum(waiting_time) / n
-        avg_tat = sum(turnaround_time) / n
-        
-        # Sorting processes back by their original order
-        sorted_by_process = sorted(zip(process_data, completion_time, turnaround_time, waiting_time), 
-                                 key=lambda x: int(x[0][0][1:]))
-        sorted_processes, completion_time, turnaround_time, waiting_time = zip(*sorted_by_process)
-        
-        self.display_table(sorted_processes, completion_time, waiting_time, turnaround_time)
-        self.plot_gantt_chart([ct - bt for ct, bt in zip(completion_time, [p[2] for p in sorted_processes])], 
-                             completion_time, n, sorted_processes)
-        
-        messagebox.showinfo("Results", f"Avg Waiting Time: {avg_wt:.2f}\nAvg Turnaround Time: {avg_tat:.2f}")
-
-    def round_robin(self, process_data, quantum):
-        n = len(process_data)
-        remaining_time = [p[2] for p in process_data]
-        arrival_time = [p[1] for p in process_data]
-        completion_time = [0] * n
-        waiting_time = [0] * n
-        turnaround_time = [0] * n
-        ready_queue = deque()
-        time = 0
-        completed = 0
-        
-        # Initialize ready queue with processes that have arrived at time 0
-        for i in range(n):
-            if arrival_time[i] == 0:
-                ready_queue.append(i)
-        
-        # To track when each process was last added to the queue
-        last_added = [-1] * n
-        
-        while completed < n:
-            if not ready_queue:
-                time += 1
-                # Check for new arrivals
-                for i in range(n):
-                    if arrival_time[i] == time and remaining_time[i] > 0 and i not in ready_queue and last_added[i] != time:
-                        ready_queue.append(i)
-                        last_added[i] = time
-                continue
-            
-            current_process = ready_queue.popleft()
-            
-            # Execute the process for quantum or remaining time, whichever is smaller
-            exec_time = min(quantum, remaining_time[current_process])
-            time += exec_time
-            remaining_time[current_process] -= exec_time
-            
-            # Check for new arrivals during this execution
-            for i in range(n):
-                if arrival_time[i] <= time and remaining_time[i] > 0 and i not in ready_queue and i != current_process and last_added[i] != time:
-                    ready_queue.append(i)
-                    last_added[i] = time
-            
-            if remaining_time[current_process] == 0:
-                completion_time[current_process] = time
-                turnaround_time[current_process] = completion_time[current_process] - arrival_time[current_process]
-                waiting_time[current_process] = turnaround_time[current_process] - process_data[current_process][2]
-                completed += 1
-            else:
-                ready_queue.append(current_process)
-        
-        # Calculate averages
-        avg_wt = sum(waiting_time) / n
-        avg_tat = sum(turnaround_time) / n
-        
-        # Sorting processes back by their original order
-        sorted_by_process = sorted(zip(process_data, completion_time, turnaround_time, waiting_time), key=lambda x: int(x[0][0][1:]))
-        sorted_processes, completion_time, turnaround_time, waiting_time = zip(*sorted_by_process)
-        
-        self.display_table(sorted_processes, completion_time, waiting_time, turnaround_time)
-        
-        # For RR, we'll show a simplified Gantt chart (more complex to show all context switches)
-        self.plot_gantt_chart([ct - bt for ct, bt in zip(completion_time, [p[2] for p in sorted_processes])], 
-                            completion_time, n, sorted_processes)
-        
-        messagebox.showinfo("Results", f"Avg Waiting Time: {avg_wt:.2f}\nAvg Turnaround Time: {avg_tat:.2f}")
-
-    def calculate_and_display(self, sorted_processes):
-        n = len(sorted_processes)
-        waiting_time = [0] * n
-        turnaround_time = [0] * n
-        completion_time = [0] * n
-        start_time = [0] * n
-        end_time = [0] * n
-
-        completion_time[0] = sorted_processes[0][1] + sorted_processes[0][2]
-        for i in range(1, n):
-            completion_time[i] = max(completion_time[i-1], sorted_processes[i][1]) + sorted_processes[i][2]
-
-        for i in range(n):
-            turnaround_time[i] = completion_time[i] - sorted_processes[i][1]
-            waiting_time[i] = turnaround_time[i] - sorted_processes[i][2]
-            start_time[i] = waiting_time[i] + sorted_processes[i][1]
-            end_time[i] = completion_time[i]
-
-        avg_wt = sum(waiting_time) / n
-        avg_tat = sum(turnaround_time) / n
-
-        self.plot_gantt_chart(start_time, end_time, n, sorted_processes)
-        self.display_table(sorted_processes, completion_time, waiting_time, turnaround_time)
-
-        messagebox.showinfo("Results", f"Avg Waiting Time: {avg_wt:.2f}\nAvg Turnaround Time: {avg_tat:.2f}")
-
-    def display_table(self, sorted_processes, completion_time, waiting_time, turnaround_time):
-        for widget in self.result_frame.winfo_children():
+    def set_trace(self, trace):
+        # A loaded trace replaces the per-process entry grid
+        for widget in self.process_frame.winfo_children():
             widget.destroy()
+        self.arrival_entries = []
+        self.burst_entries = []
+        self.priority_entries = []
+        self.trace = trace
+        tk.Label(self.process_frame, text=f"Loaded {len(trace)} processes from trace", fg="white", bg="#2c3e50").pack()
 
-        headers = ["Process", "Arrival Time", "Burst Time", "Completion Time", "Turnaround Time", "Waiting Time"]
-        table = ttk.Treeview(self.result_frame, columns=headers, show="headings", height=8)
+    def run_simulation(self):
+        try:
+            if self.trace is not None:
+                table = self.trace
+            else:
+                burst_times = [int(bt.get()) for bt in self.burst_entries]
+                arrival_times = [int(at.get()) for at in self.arrival_entries]
+                priorities = [int(pr.get()) if self.algorithm.get() in ("Priority", "Priority (Preemptive)") else 0 for pr in self.priority_entries]
+                table = ProcessTable(arrival_times, burst_times, priorities)
 
-        for header in headers:
-            table.heading(header, text=header)
-            table.column(header, width=100, anchor="center")
+            if len(table) == 0:
+                raise ValueError("Set the processes or load a trace first.")
 
-        for i, process in enumerate(sorted_processes):
-            table.insert("", "end", values=(process[0], process[1], process[2], completion_time[i], turnaround_time[i], waiting_time[i]))
+            quantum = None
+            if self.algorithm.get() == "Round Robin":
+                quantum = int(self.quantum_entry.get())
 
-        table.pack()
+            aging = 0
+            if self.algorithm.get() == "Priority (Preemptive)":
+                aging = float(self.aging_entry.get())
 
-    def plot_gantt_chart(self, start, end, n, sorted_processes):
-        colors = plt.cm.tab10(np.linspace(0, 1, n))
-        fig, ax = plt.subplots(figsize=(10, 2))
+            cores = int(self.cores_entry.get())
+            if cores <= 0:
+                raise ValueError("Number of cores must be positive.")
+            if cores > 1 and self.algorithm.get() not in MultiCore.ALGORITHMS:
+                raise ValueError(f"{self.algorithm.get()} only runs on one core.")
 
-        for i in range(n):
-            ax.barh(0, end[i] - start[i], left=start[i], color=colors[i], edgecolor="black", height=0.8)
-            ax.text(start[i] + (end[i] - start[i]) / 2, 0, sorted_processes[i][0], ha='center', va='center', color='white', fontsize=12, fontweight='bold')
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        # Settings are captured now, so queued runs are unaffected by later edits
+        algorithm = self.algorithm.get()
+        balancing = self.balancing.get()
+        label = algorithm if cores == 1 else f"{algorithm} on {cores} cores"
+        from_entries = self.trace is None
+        self.runs.submit(label, lambda progress: self.evaluate(*self.simulate(algorithm, table, quantum, aging, cores, balancing, from_entries, progress)),
+                         lambda outcome: self.display_results(*outcome), self.show_error)
+
+    def evaluate(self, result, multi):
+        # Runs on the worker thread: the metrics pass is linear in the schedule size
+        return result, multi, (multi or result).metrics()
+
+    def simulate(self, algorithm, table, quantum, aging, cores, balancing, from_entries, progress):
+        # Runs on the worker thread: computes only, never touches widgets
+        if from_entries and cores == 1 and algorithm in Incremental.ALGORITHMS:
+            return self.reschedule(algorithm, table, quantum, progress), None
+        if cores != 1:
+            multi = self.cache.get_or_run(
+                table, algorithm,
+                lambda: MultiCore.simulate(algorithm, table.arrival.tolist(), table.burst.tolist(), table.priority.tolist(),
+                                           cores, quantum, balancing, progress=progress),
+                quantum=quantum, cores=cores, balancing=balancing)
+            return multi.schedule, multi
+        result = self.cache.get_or_run(table, algorithm, lambda: VectorEngine.run(algorithm, table, quantum, aging, progress),
+                                       quantum=quantum, aging=aging)
+        return result, None
+
+    def reschedule(self, algorithm, table, quantum, progress):
+        # Edited entries only recompute the part of the schedule the changed rows affect.
+        # A cancelled build is never stored; a cancelled sync leaves the schedule
+        # consistent, with the remaining rows applied by the next run.
+        key = (algorithm, quantum)
+        schedule = self.incremental.get(key)
+        if schedule is None or len(schedule.alive) != len(table):
+            schedule = self.incremental[key] = Incremental.IncrementalSchedule(algorithm, table, quantum, progress)
+        else:
+            schedule.sync(table, progress)
+        return schedule.result()
+
+    def cancel_simulation(self):
+        self.runs.cancel()
+
+    def show_error(self, error):
+        messagebox.showerror("Error", str(error))
+
+    def display_results(self, result, multi=None, metrics=None):
+        self.display_table(result)
+        self.plot_gantt_chart(result, multi)
+
+        summary = f"Avg Waiting Time: {result.avg_waiting:.2f}\nAvg Turnaround Time: {result.avg_turnaround:.2f}"
+        if metrics is not None:
+            summary += (f"\nWaiting p50/p95/p99/p99.9: {metrics['p50_waiting']:.2f} / {metrics['p95_waiting']:.2f} / "
+                        f"{metrics['p99_waiting']:.2f} / {metrics['p99.9_waiting']:.2f}"
+                        f"\nTurnaround p95/p99: {metrics['p95_turnaround']:.2f} / {metrics['p99_turnaround']:.2f}"
+                        f"\nAvg Response Time: {metrics['avg_response']:.2f}"
+                        f"\nAvg Slowdown: {metrics['avg_slowdown']:.2f} (p99 {metrics['p99_slowdown']:.2f})"
+                        f"\nCPU Utilization: {metrics['utilization']:.0%}"
+                        f"\nContext Switches: {metrics['context_switches']}"
+                        f"\nJain's Fairness Index: {metrics['fairness']:.3f}")
+        if multi is not None:
+            for core in range(multi.cores):
+                summary += f"\nCore {core}: {multi.utilization[core]:.0%} busy, {multi.energy[core]:.2f} energy units"
+        messagebox.showinfo("Results", summary)
+
+    def display_table(self, result):
+        for widget in self.result_frame.winfo_children():
+            widget.destroy()
 
-        ax.set_yticks([0])
+        # Only the visible page of rows is materialized, straight from the result columns
+        columns = {
+            "Process": range(1, len(result) + 1),
+            "Arrival Time": result.arrival,
+            "Burst Time": result.burst,
+            "Completion Time": result.completion,
+            "Turnaround Time": result.turnaround,
+            "Waiting Time": result.waiting,
+        }
+        ResultsView(self.result_frame, columns, formats={"Process": "P{}"}, height=8, bg="#2c3e50").pack()
+
+    def plot_gantt_chart(self, result, multi=None):
+        # Plotting stack is only needed once there is something to draw
+        import matplotlib.pyplot as plt
+
+        # Release the previous run's figure before drawing a new one
+        if self.figure is not None:
+            plt.close(self.figure)
+
+        rows = multi.cores if multi is not None else 1
+        slice_core = multi.slice_core if multi is not None else None
+        fig, ax = plt.subplots(figsize=(10, 1 + rows))
+        self.figure = fig
+
+        # Every executed slice, so preemptive runs show each context switch; huge
+        # schedules collapse into utilization bands instead of one bar per slice
+        Timeline.draw(ax, result.slices, slice_core, rows)
+
+        if multi is not None:
+            ax.set_yticklabels([f"Core {core}" for core in range(rows)])
         ax.set_xlabel("Time")
         ax.set_title("Gantt Chart")
         plt.tight_layout()
         plt.show()
 
-root = tk.Tk()
-scheduler = CPUScheduler(root)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    scheduler = CPUScheduler(root)
+    root.mainloop()
@@ -0,0 +1,140 @@
+import argparse
+
+import numpy as np
+
+from VectorEngine import SliceColumns
+
+# Gantt timeline renderer that scales to millions of slices.
+#
+# Every bar of a row goes into one PolyCollection instead of one barh call per
+# slice. Slices narrower than a pixel cannot be seen individually, so they are
+# summed per pixel column into a utilization band (darker = busier); only
+# slices at least a pixel wide are drawn as coloured bars, and only bars wide
+# enough for their text get a label. The number of drawn shapes is therefore
+# bounded by rows x pixels, not by the number of slices.
+#
+# Uses matplotlib.figure.Figure directly, so images can be written without a
+# display or a Tk window.
+
+MIN_BAR_PIXELS = 1
+MIN_LABEL_PIXELS = 30
+MAX_LABELS = 200
+
+
+def slice_columns(slices, rows=None):
+    # (pid, start, end, row) arrays from SliceColumns or a list of Slice tuples
+    columns = SliceColumns.from_slices(slices)
+    pid, start, end = np.asarray(columns.pid), np.asarray(columns.start), np.asarray(columns.end)
+    row = np.zeros(len(pid), dtype=np.intp) if rows is None else np.asarray(rows, dtype=np.intp)
+    return pid, start, end, row
+
+
+def draw(ax, slices, rows=None, row_count=1, names=None, pixels=None, label="P{}"):
+    # Draw slices on ax, one horizontal row per core. names maps pid -> the value
+    # put into `label` (pid + 1 without it); only bars that get a label are formatted
+    from matplotlib.collections import PolyCollection
+    from matplotlib import colormaps
+
+    pid, start, end, row = slice_columns(slices, rows)
+    if len(pid) == 0:
+        ax.set_yticks(range(row_count))
+        return
+
+    t0 = start.min().item()
+    t1 = max(end.max().item(), t0 + 1)
+    ax.set_xlim(t0, t1)
+    ax.set_ylim(-0.5, row_count - 0.5)
+    if pixels is None:
+        pixels = max(int(ax.get_window_extent().width), 1)
+    pixel = (t1 - t0) / pixels  # time units per pixel column
+
+    width = end - start
+    wide = width >= MIN_BAR_PIXELS * pixel
+
+    # Sub-pixel slices: busy time per (row, pixel column) -> one grey band per column
+    narrow = ~wide
+    if narrow.any():
+        column = np.minimum(((start[narrow] - t0) / pixel).astype(np.int64), pixels - 1)
+        busy = np.bincount(row[narrow] * pixels + column, weights=width[narrow], minlength=row_count * pixels)
+        cells = np.flatnonzero(busy)
+        level = np.minimum(busy[cells] / pixel, 1.0)
+        colors = np.zeros((len(cells), 4))
+        colors[:, 3] = 0.25 + 0.75 * level
+        ax.add_collection(PolyCollection(_boxes(t0 + (cells % pixels) * pixel, pixel, cells // pixels),
+                                         facecolors=colors, edgecolors="none"))
+
+    if wide.any():
+        colors = colormaps["tab10"](pid[wide] % 10)
+        ax.add_collection(PolyCollection(_boxes(start[wide], width[wide], row[wide]),
+                                         facecolors=colors, edgecolors="black", linewidths=0.5))
+
+        # Labels only where the text fits, widest first
+        labelled = np.flatnonzero(width >= MIN_LABEL_PIXELS * pixel)
+        labelled = labelled[np.argsort(-width[labelled], kind="stable")[:MAX_LABELS]]
+        for i in labelled.tolist():
+            name = label.format(names[pid[i]] if names is not None else pid[i] + 1)
+            ax.text(start[i] + width[i] / 2, row[i], name, ha="center", va="center",
+                    color="white", fontsize=10, fontweight="bold", clip_on=True)
+
+    ax.set_yticks(range(row_count))
+
+
+def _boxes(left, width, row, height=0.8):
+    # (k, 4, 2) rectangle vertices for PolyCollection
+    left = np.asarray(left, dtype=np.float64)
+    right = left + width
+    bottom = np.asarray(row, dtype=np.float64) - height / 2
+    top = bottom + height
+    boxes = np.empty((len(left), 4, 2))
+    boxes[:, 0, 0] = boxes[:, 1, 0] = left
+    boxes[:, 2, 0] = boxes[:, 3, 0] = right
+    boxes[:, 0, 1] = boxes[:, 3, 1] = bottom
+    boxes[:, 1, 1] = boxes[:, 2, 1] = top
+    return boxes
+
+
+def figure(result, multi=None, names=None, title="Gantt Chart", width=10, dpi=100):
+    # Headless Figure for a ScheduleResult (and its MultiCoreResult, one row per core)
+    from matplotlib.figure import Figure
+
+    rows = multi.cores if multi is not None else 1
+    fig = Figure(figsize=(width, 1 + rows), dpi=dpi)
+    ax = fig.add_subplot()
+    fig.subplots_adjust(left=0.08, right=0.98, bottom=0.5 / (1 + rows), top=1 - 0.4 / (1 + rows))
+    draw(ax, result.slices, multi.slice_core if multi is not None else None, rows, names)
+
+    if multi is not None:
+        ax.set_yticklabels([f"Core {core}" for core in range(rows)])
+    else:
+        ax.set_yticklabels([""])
+    ax.set_xlabel("Time")
+    ax.set_title(title)
+    return fig
+
+
+def save(result, path, multi=None, names=None, title="Gantt Chart", width=10, dpi=100):
+    # Format follows the file extension (.png, .svg, .pdf, ...)
+    figure(result, multi, names, title, width, dpi).savefig(path)
+
+
+def main():
+    import SchedulingEngine
+    import TraceLoader
+    import VectorEngine
+
+    parser = argparse.ArgumentParser(description="Render the Gantt chart of a scheduled trace to an image file.")
+    parser.add_argument("trace", help="CSV (.csv) or binary trace file")
+    parser.add_argument("--algorithm", default="FCFS", choices=SchedulingEngine.ALGORITHMS)
+    parser.add_argument("--quantum", type=int, default=2, help="Round Robin time quantum")
+    parser.add_argument("--out", default="gantt.png", help="output image (.png or .svg)")
+    parser.add_argument("--width", type=float, default=10, help="figure width in inches")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    result = VectorEngine.run(args.algorithm, TraceLoader.load(args.trace), args.quantum)
+    save(result, args.out, title=f"Gantt Chart - {args.algorithm}", width=args.width, dpi=args.dpi)
+    print(f"Wrote {len(result.slices)} slices to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import itertools
+
+import numpy as np
+
+import VectorEngine
+from VectorEngine import CHUNK_SIZE, ProcessTable
+
+# Job traces on disk, streamed into ProcessTable chunks.
+#
+# CSV: one job per line as "arrival,burst[,priority]", with an optional header
+# naming the columns (any order). A chunk with a fractional value is read as float64.
+# Binary: a 16-byte header (magic, version, record count) followed by fixed-width
+# little-endian integer records, read through a memory map.
+
+MAGIC = b"SCHT"
+VERSION = 1
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u4"), ("count", "<u8")])
+RECORD_DTYPE = np.dtype([("arrival", "<i8"), ("burst", "<i4"), ("priority", "<i4")])
+
+COLUMNS = ("arrival", "burst", "priority")
+
+
+def load(path):
+    # Whole trace as one ProcessTable, format picked by extension
+    if str(path).endswith(".csv"):
+        return concat(iter_csv(path))
+    return load_binary(path)
+
+
+def concat(chunks):
+    chunks = list(chunks)
+    if not chunks:
+        return ProcessTable([], [], [])
+    return ProcessTable(np.concatenate([c.arrival for c in chunks]),
+                        np.concatenate([c.burst for c in chunks]),
+                        np.concatenate([c.priority for c in chunks]))
+
+
+def iter_csv(path, chunk_size=CHUNK_SIZE):
+    with open(path, newline="") as f:
+        first = f.readline()
+        if not first.strip():
+            return
+        fields = [name.strip().lower() for name in first.split(",")]
+        if all(_is_number(name) for name in fields):
+            # No header, the first line is already a job
+            lines = itertools.chain([first], f)
+            usecols = list(range(min(len(fields), 3)))
+        else:
+            if "arrival" not in fields or "burst" not in fields:
+                raise ValueError(f"{path}: CSV header must name 'arrival' and 'burst' columns.")
+            lines = f
+            usecols = [fields.index(name) for name in COLUMNS if name in fields]
+
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                break
+            try:
+                data = np.loadtxt(block, delimiter=",", dtype=np.int64, usecols=usecols, ndmin=2)
+            except ValueError:
+                data = np.loadtxt(block, delimiter=",", dtype=np.float64, usecols=usecols, ndmin=2)
+            priority = data[:, 2] if data.shape[1] > 2 else None
+            yield ProcessTable(data[:, 0], data[:, 1], priority)
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def open_binary(path):
+    # Memory-mapped record array; nothing is read until it is sliced
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{path}: not a binary trace file.")
+    if header["version"][0] != VERSION:
+        raise ValueError(f"{path}: unsupported trace version {header['version'][0]}.")
+    count = int(header["count"][0])
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+def load_binary(path):
+    records = open_binary(path)
+    return ProcessTable(records["arrival"], records["burst"], records["priority"])
+
+
+def iter_binary(path, chunk_size=CHUNK_SIZE):
+    records = open_binary(path)
+    for lo in range(0, len(records), chunk_size):
+        chunk = records[lo:lo + chunk_size]
+        yield ProcessTable(chunk["arrival"], chunk["burst"], chunk["priority"])
+
+
+def write_binary(path, chunks):
+    # chunks: a ProcessTable or any iterable of them, written without concatenating
+    if isinstance(chunks, ProcessTable):
+        chunks = [chunks]
+    count = 0
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER_DTYPE.itemsize))
+        for chunk in chunks:
+            if len(chunk):
+                for name in COLUMNS:
+                    _check_field(path, name, getattr(chunk, name))
+            records = np.empty(len(chunk), dtype=RECORD_DTYPE)
+            records["arrival"] = chunk.arrival
+            records["burst"] = chunk.burst
+            records["priority"] = chunk.priority
+            records.tofile(f)
+            count += len(chunk)
+        f.seek(0)
+        np.array([(MAGIC, VERSION, count)], dtype=HEADER_DTYPE).tofile(f)
+    return count
+
+
+def _check_field(path, name, values):
+    # Assigning into the integer records would silently truncate or wrap
+    if values.dtype.kind == "f" and not np.array_equal(values, np.trunc(values)):
+        raise ValueError(f"{path}: {name} must be whole numbers in the binary format.")
+    info = np.iinfo(RECORD_DTYPE[name])
+    if values.min() < info.min or values.max() > info.max:
+        raise ValueError(f"{path}: {name} must fit in {info.bits} bits.")
+
+
+def iter_trace(path, chunk_size=CHUNK_SIZE):
+    if str(path).endswith(".csv"):
+        return iter_csv(path, chunk_size)
+    return iter_binary(path, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or convert a job trace.")
+    parser.add_argument("trace", help="CSV (.csv) or binary trace file")
+    parser.add_argument("--convert", metavar="OUT", help="write the trace in the binary format")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.convert:
+        count = write_binary(args.convert, iter_trace(args.trace, args.chunk_size))
+        print(f"Wrote {count} jobs to {args.convert}")
+        return
+
+    summary = VectorEngine.fcfs_summary(iter_trace(args.trace, args.chunk_size))
+    print(f"Jobs: {summary['count']}")
+    print(f"FCFS Avg Waiting Time: {summary['avg_waiting']:.2f}")
+    print(f"FCFS Avg Turnaround Time: {summary['avg_turnaround']:.2f}")
+    print(f"Total Energy Consumption: {summary['energy']:.2f} units")
+
+
+if __name__ == "__main__":
+    main()
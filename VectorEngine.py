@@ -0,0 +1,209 @@
+import itertools
+from array import array
+
+import numpy as np
+
+import SchedulingEngine
+from SchedulingEngine import ScheduleResult, Slice
+
+# Columnar (struct-of-arrays) counterparts of the SchedulingEngine policies for
+# traces too large to hold as Python tuples. Work is done chunk by chunk so the
+# temporaries stay bounded no matter how long the trace is.
+
+CHUNK_SIZE = 1 << 20
+
+
+class ProcessTable:
+    def __init__(self, arrival, burst, priority=None):
+        self.arrival = _column(arrival)
+        self.burst = _column(burst)
+        if priority is None:
+            self.priority = np.zeros(len(self.arrival), dtype=np.int64)
+        else:
+            self.priority = _column(priority)
+
+        if not (len(self.arrival) == len(self.burst) == len(self.priority)):
+            raise ValueError("Arrival, burst and priority columns must have the same length.")
+
+    def __len__(self):
+        return len(self.arrival)
+
+    @classmethod
+    def from_records(cls, records):
+        # records: iterable of (arrival, burst) or (arrival, burst, priority)
+        records = list(records)
+        arrival = [r[0] for r in records]
+        burst = [r[1] for r in records]
+        priority = [r[2] if len(r) > 2 else 0 for r in records]
+        return cls(arrival, burst, priority)
+
+    def is_sorted(self):
+        return bool(np.all(self.arrival[1:] >= self.arrival[:-1]))
+
+    def take(self, index):
+        return ProcessTable(self.arrival[index], self.burst[index], self.priority[index])
+
+
+class SliceColumns:
+    # Executed slices stored as three parallel arrays; iterates as Slice tuples
+    def __init__(self, pid, start, end):
+        self.pid = pid
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return len(self.pid)
+
+    @classmethod
+    def from_slices(cls, slices):
+        # Columns from a SliceLog (its typed arrays are shared, not copied) or a
+        # list of Slice tuples in one flat pass
+        if isinstance(slices, cls):
+            return slices
+        if hasattr(slices, "pid"):
+            return cls(np.frombuffer(slices.pid, np.int64), np.frombuffer(slices.start, slices.start.typecode),
+                       np.frombuffer(slices.end, slices.end.typecode))
+        if not len(slices):
+            return cls(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        dtype = np.int64 if isinstance(slices[0].start, int) and isinstance(slices[0].end, int) else np.float64
+        flat = np.fromiter(itertools.chain.from_iterable(slices), dtype, 3 * len(slices)).reshape(-1, 3)
+        return cls(flat[:, 0].astype(np.int64), flat[:, 1], flat[:, 2])
+
+    def __iter__(self):
+        for chunk in range(0, len(self.pid), CHUNK_SIZE):
+            window = slice(chunk, chunk + CHUNK_SIZE)
+            yield from map(Slice._make, zip(self.pid[window].tolist(), self.start[window].tolist(), self.end[window].tolist()))
+
+    def __getitem__(self, i):
+        return Slice(int(self.pid[i]), self.start[i].item(), self.end[i].item())
+
+
+def _values(column):
+    # Typed-array copy of a column for the event loops: 8 bytes a job, where a
+    # list from .tolist() costs a pointer plus a boxed number for each
+    values = array("d" if column.dtype.kind == "f" else "q")
+    values.frombytes(memoryview(np.ascontiguousarray(column)).cast("B"))
+    return values
+
+
+def _column(values):
+    column = np.asarray(values)
+    if column.dtype.kind == "f":
+        return column.astype(np.float64, copy=False)
+    if column.dtype.kind in "iub" or len(column) == 0:
+        return column.astype(np.int64, copy=False)
+    raise ValueError("Process columns must be numeric.")
+
+
+def fcfs_completion(arrival, burst, time=0, chunk_size=CHUNK_SIZE, out=None, progress=None):
+    # Completion times of arrival-sorted jobs run back to back.
+    #   C[i] = max(C[i-1], A[i]) + B[i]
+    # unrolls to C[i] = S[i] + max(time, max_{j<=i}(A[j] - S[j-1])) with S the
+    # prefix sum of bursts, i.e. one cumsum plus one running maximum per chunk.
+    # progress(done, total) is called after each chunk.
+    n = len(arrival)
+    if out is None:
+        out = np.empty(n, dtype=np.result_type(arrival, burst))
+    for lo in range(0, n, chunk_size):
+        hi = min(lo + chunk_size, n)
+        time = _fcfs_chunk(arrival[lo:hi], burst[lo:hi], time, out[lo:hi])
+        if progress is not None:
+            progress(hi, n)
+    return out
+
+
+def _fcfs_chunk(arrival, burst, time, out):
+    np.cumsum(burst, out=out)
+    bound = arrival - (out - burst)
+    np.maximum.accumulate(bound, out=bound)
+    np.maximum(bound, time, out=bound)
+    out += bound
+    return out[-1]
+
+
+def energy(burst, base_energy_unit=1.5, threshold=5, low_factor=0.8, high_factor=1.2, chunk_size=CHUNK_SIZE):
+    # Same DVFS model as SchedulingEngine.energy, as a burst-threshold mask
+    long_work = 0
+    total_work = 0
+    for lo in range(0, len(burst), chunk_size):
+        chunk = burst[lo:lo + chunk_size]
+        long_work += chunk.sum(where=chunk > threshold).item()
+        total_work += chunk.sum().item()
+    return base_energy_unit * (low_factor * long_work + high_factor * (total_work - long_work))
+
+
+def fcfs(table, probe=None, progress=None):
+    # First Come First Serve over a ProcessTable, ties broken by input order.
+    # There is no event loop to count; a probe gets the phase timings only.
+    if probe is not None:
+        probe.start()
+    if table.is_sorted():
+        order = np.arange(len(table))
+        completion = fcfs_completion(table.arrival, table.burst, progress=progress)
+        end = completion
+        start = completion - table.burst
+    else:
+        order = np.argsort(table.arrival, kind="stable")
+        end = fcfs_completion(table.arrival[order], table.burst[order], progress=progress)
+        start = end - table.burst[order]
+        completion = np.empty_like(end)
+        completion[order] = end
+    if probe is not None:
+        probe.lap("schedule")
+
+    turnaround = completion - table.arrival
+    waiting = turnaround - table.burst
+    slices = SliceColumns(order, start, end)
+    result = ScheduleResult("FCFS", table.arrival, table.burst, completion, turnaround, waiting, slices, energy(table.burst))
+    if probe is not None:
+        probe.lap("result")
+    return result
+
+
+def run(algorithm, table, quantum=None, aging=0, progress=None, probe=None):
+    # FCFS stays columnar; the queue-driven policies go through SchedulingEngine
+    if algorithm == "FCFS":
+        return fcfs(table, probe, progress)
+    priority = _values(table.priority) if algorithm in ("Priority", "Priority (Preemptive)") else None
+    return SchedulingEngine.run(algorithm, _values(table.arrival), _values(table.burst), priority, quantum, aging, progress, probe)
+
+
+def fcfs_stream(chunks):
+    # FCFS over an arrival-sorted stream of ProcessTable chunks, one result per
+    # chunk, carrying the CPU's free time across chunk boundaries
+    time = 0
+    last_arrival = None
+    for table in chunks:
+        if len(table) == 0:
+            continue
+        if not table.is_sorted() or (last_arrival is not None and table.arrival[0] < last_arrival):
+            raise ValueError("Streamed traces must be sorted by arrival time.")
+        last_arrival = table.arrival[-1]
+
+        completion = fcfs_completion(table.arrival, table.burst, time)
+        time = completion[-1]
+        turnaround = completion - table.arrival
+        waiting = turnaround - table.burst
+        slices = SliceColumns(np.arange(len(table)), completion - table.burst, completion)
+        yield ScheduleResult("FCFS", table.arrival, table.burst, completion, turnaround, waiting, slices, energy(table.burst))
+
+
+def fcfs_summary(chunks):
+    # Averages and energy of a streamed FCFS run without keeping per-job columns
+    count = 0
+    total_waiting = 0
+    total_turnaround = 0
+    total_energy = 0.0
+    for result in fcfs_stream(chunks):
+        count += len(result)
+        total_waiting += result.waiting.sum().item()
+        total_turnaround += result.turnaround.sum().item()
+        total_energy += result.energy
+    if count == 0:
+        raise ValueError("Trace contains no jobs.")
+    return {
+        "count": count,
+        "avg_waiting": total_waiting / count,
+        "avg_turnaround": total_turnaround / count,
+        "energy": total_energy,
+    }